@@ -0,0 +1,108 @@
+import settings as s
+from texturebank import texture_bank, get_animation_name
+
+# A frame position this close under a whole frame counts as that frame, so adding up delta times doesn't lose one
+FRAME_EPSILON = 1e-6
+
+
+class Animation:
+    def __init__(self, name, fps, loop):
+        self.name = name
+        self.fps = fps
+        self.loop = loop
+        self.frame_count = len(texture_bank.animations[name])
+
+        # The frames are only taken from the texture bank the first time the animation plays
+        self.frames = None
+
+    def get_frames(self):
+        if self.frames is None:
+            self.frames = texture_bank.get_frames(self.name)
+        return self.frames
+
+
+class AnimationSet:
+    def __init__(self, entity, manifest=None):
+
+        # Every animation of the entity by state and direction in one dict, the direction is None for the states that
+        # don't turn. A direction without its own frames for a state plays the fallback state's frames instead
+        manifest = texture_bank.animation_manifest[entity] if manifest is None else manifest
+        self.entity = entity
+        self.animations = {}
+        for state, options in manifest["states"].items():
+            fps = options.get("fps", manifest.get("fps", s.ANIMATION_FPS))
+            loop = options.get("loop", manifest.get("loop", True))
+            if isinstance(options["frames"], dict):
+                for direction in options["frames"]:
+                    self.animations[state, direction] = Animation(get_animation_name(entity, state, direction), fps,
+                                                                  loop)
+            else:
+                self.animations[state, None] = Animation(get_animation_name(entity, state), fps, loop)
+        for state, options in manifest["states"].items():
+            if "fallback" in options:
+                for (fallback_state, direction), animation in list(self.animations.items()):
+                    if fallback_state == options["fallback"]:
+                        self.animations.setdefault((state, direction), animation)
+
+    def get(self, state, direction=None):
+        return self.animations[state, direction]
+
+
+# The animation sets are shared by every sprite of an entity
+animation_sets = {}
+
+
+def get_animation_set(entity):
+    animation_set = animation_sets.get(entity)
+    if animation_set is None:
+        animation_set = animation_sets[entity] = AnimationSet(entity)
+    return animation_set
+
+
+class Animator:
+    def __init__(self, entity, state, direction=None):
+
+        # Plays one sprite's animations, the frame moves on with the time passed so the speed doesn't depend on how
+        # often it's updated
+        self.animation_set = get_animation_set(entity)
+        self.animation = None
+        self.state = None
+        self.direction = None
+        self.frame = 0.0
+        self.index = 0
+        self.is_finished = False
+        self.play(state, direction)
+
+    def play(self, state, direction=None, restart=None):
+
+        # Switch to the animation of the state and direction. It starts over when the state changes, unless told
+        # otherwise, and when it had finished, while turning keeps the frame
+        if restart is None:
+            restart = state != self.state
+        self.animation = self.animation_set.get(state, direction)
+        self.state = state
+        self.direction = direction
+        if restart or self.is_finished:
+            self.frame = 0.0
+            self.index = 0
+            self.is_finished = False
+
+    def update(self, delta_time):
+
+        # Move the frame on and return the texture to show. Looping animations wrap around, the others stop on their
+        # last frame and are finished
+        frames = self.animation.get_frames()
+        self.frame += delta_time * self.animation.fps
+        index = int(self.frame + FRAME_EPSILON)
+        if index >= len(frames):
+            if self.animation.loop:
+                self.frame %= len(frames)
+                index = int(self.frame + FRAME_EPSILON) % len(frames)
+            else:
+                self.is_finished = True
+                index = len(frames) - 1
+        self.index = index
+        return frames[index]
+
+    def get_texture(self):
+        return self.animation.get_frames()[self.index]
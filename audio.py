@@ -0,0 +1,91 @@
+import collections
+import random
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import arcade
+import settings as s
+
+
+class AudioManager:
+    def __init__(self, effects=s.SOUND_EFFECTS, music=s.MUSIC_TRACK, voice_limits=s.VOICE_LIMITS,
+                 workers=s.SOUND_LOAD_WORKERS):
+
+        # The effects are decoded into memory once, and the music is opened to be streamed from disk while it plays.
+        # Both are loaded in a pool of threads so the game never waits on the disk, a sound that isn't loaded yet is
+        # skipped and the music starts once it's there
+        executor = ThreadPoolExecutor(workers)
+        self.loading = {category: [executor.submit(arcade.load_sound, file_path) for file_path in file_paths]
+                        for category, file_paths in effects.items()}
+        self.music_loading = executor.submit(arcade.load_sound, music, streaming=True)
+        executor.shutdown(wait=False)
+        self.sounds = {}
+        self.music = None
+        self.music_player = None
+
+        # The players of every category still playing, oldest first. A category never plays more than its limit at
+        # once, a new sound stops the oldest one instead
+        self.voice_limits = voice_limits
+        self.voices = {category: collections.deque() for category in effects}
+        self.sound_counts = {category: len(file_paths) for category, file_paths in effects.items()}
+
+        # Stats
+        self.played = 0
+        self.stolen = 0
+        self.skipped = 0
+
+    def update(self):
+
+        # Take in whatever finished loading, on the game thread since that's where the sounds are played. A sound that
+        # failed to load is reported on stderr, away from the JSON reports on stdout, and left out. Its category is
+        # skipped and the game goes on without the music
+        for category, futures in list(self.loading.items()):
+            if all(future.done() for future in futures):
+                del self.loading[category]
+                try:
+                    self.sounds[category] = [future.result() for future in futures]
+                except Exception as error:
+                    print(f"Couldn't load the {category} sounds, playing without them: {error}", file=sys.stderr)
+        if self.music_loading is not None and self.music_loading.done():
+            music_loading = self.music_loading
+            self.music_loading = None
+            try:
+                self.music = music_loading.result()
+            except Exception as error:
+                print(f"Couldn't load the music, playing without it: {error}", file=sys.stderr)
+                return
+            self.music_player = arcade.play_sound(self.music, s.MUSIC_VOLUME, loop=True)
+
+    def play(self, category, volume=1.0):
+
+        # Play one of the category's sounds at random, or nothing if they're still loading. The pick is made either way
+        # so the game's random numbers don't depend on how fast the disk is
+        index = random.randrange(self.sound_counts[category]) if self.sound_counts[category] > 1 else 0
+        sounds = self.sounds.get(category)
+        if sounds is None:
+            self.skipped += 1
+            return None
+        voices = self.voices[category]
+        while voices and not voices[0].playing:
+            voices.popleft()
+        while len(voices) >= self.voice_limits[category]:
+            arcade.stop_sound(voices.popleft())
+            self.stolen += 1
+        player = arcade.play_sound(sounds[index], volume)
+        if player is not None:
+            voices.append(player)
+        self.played += 1
+        return player
+
+    def get_voice_count(self):
+        return sum(sum(1 for voice in voices if voice.playing) for voices in self.voices.values())
+
+    def stats(self):
+        return {
+            "loaded": len(self.sounds) + (self.music is not None),
+            "loading": len(self.loading) + (self.music_loading is not None),
+            "voices": self.get_voice_count(),
+            "played": self.played,
+            "stolen": self.stolen,
+            "skipped": self.skipped,
+        }
@@ -0,0 +1,97 @@
+import time
+
+import numpy as np
+
+
+def get_boxes(sprites):
+
+    # The left, right, bottom and top of every sprite's hit box as columns of one array
+    return np.array([(sprite.left, sprite.right, sprite.bottom, sprite.top) for sprite in sprites],
+                    dtype=float).reshape(-1, 4)
+
+
+class BarrierGrid:
+    def __init__(self, moving_sprite, blocking_sprites, grid_size, left, right, bottom, top):
+
+        # The same grid as arcade.AStarBarrierList: a cell is blocked when the moving sprite centered on
+        # cell * grid size would touch a blocking sprite. The bounds are in cells like there
+        self.grid_size = grid_size
+        self.left = int(left // grid_size)
+        self.right = int(right // grid_size)
+        self.bottom = int(bottom // grid_size)
+        self.top = int(top // grid_size)
+
+        # How far the moving sprite's hit box reaches from its center, it's tested as a box like the walls are
+        points = np.array(moving_sprite.hit_box.get_adjusted_points()) - moving_sprite.position
+        self.extent = (points[:, 0].min(), points[:, 0].max(), points[:, 1].min(), points[:, 1].max())
+
+        # How many blocking sprites cover each cell, so taking one away only opens the cells no other one covers
+        self.counts = np.zeros((self.right - self.left + 1, self.top - self.bottom + 1), dtype=np.int32)
+        self.blocked = np.zeros(self.counts.shape, dtype=bool)
+
+        # The callbacks told about every region of cells that changed, as left, right, bottom, top in cells
+        self.subscribers = []
+
+        # Stats
+        self.updates = 0
+        start_time = time.perf_counter()
+        self.rasterize(get_boxes(blocking_sprites), 1)
+        self.build_time = time.perf_counter() - start_time
+
+    def get_cell_ranges(self, boxes):
+
+        # The first and last cell each box blocks on both axes, clipped to the grid and relative to its corner. A box
+        # that misses the grid comes back with a first cell past its last
+        extent_left, extent_right, extent_bottom, extent_top = self.extent
+        first_x = np.floor((boxes[:, 0] - extent_right) / self.grid_size).astype(int) + 1
+        last_x = np.ceil((boxes[:, 1] - extent_left) / self.grid_size).astype(int) - 1
+        first_y = np.floor((boxes[:, 2] - extent_top) / self.grid_size).astype(int) + 1
+        last_y = np.ceil((boxes[:, 3] - extent_bottom) / self.grid_size).astype(int) - 1
+        return (np.clip(first_x - self.left, 0, None), np.clip(last_x - self.left, None, self.counts.shape[0] - 1),
+                np.clip(first_y - self.bottom, 0, None), np.clip(last_y - self.bottom, None, self.counts.shape[1] - 1))
+
+    def rasterize(self, boxes, change):
+
+        # Add change to the count of every cell under the boxes in one pass: mark the corners of each box's cells in
+        # a difference array and add it up along both axes
+        first_x, last_x, first_y, last_y = self.get_cell_ranges(boxes)
+        inside = (first_x <= last_x) & (first_y <= last_y)
+        if not inside.any():
+            return None
+        first_x, last_x, first_y, last_y = first_x[inside], last_x[inside], first_y[inside], last_y[inside]
+        difference = np.zeros((self.counts.shape[0] + 1, self.counts.shape[1] + 1), dtype=np.int32)
+        np.add.at(difference, (first_x, first_y), change)
+        np.add.at(difference, (last_x + 1, first_y), -change)
+        np.add.at(difference, (first_x, last_y + 1), -change)
+        np.add.at(difference, (last_x + 1, last_y + 1), change)
+        self.counts += difference.cumsum(axis=0).cumsum(axis=1)[:-1, :-1]
+        self.blocked = self.counts > 0
+        return (int(first_x.min()) + self.left, int(last_x.max()) + self.left,
+                int(first_y.min()) + self.bottom, int(last_y.max()) + self.bottom)
+
+    def add(self, sprites):
+        self.update(get_boxes(sprites), 1)
+
+    def remove(self, sprites):
+        self.update(get_boxes(sprites), -1)
+
+    def update(self, boxes, change):
+        region = self.rasterize(boxes, change)
+        if region is None:
+            return
+        self.updates += 1
+        for subscriber in self.subscribers:
+            subscriber(region)
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    def is_blocked(self, cell):
+        x, y = cell[0] - self.left, cell[1] - self.bottom
+        return 0 <= x < self.blocked.shape[0] and 0 <= y < self.blocked.shape[1] and bool(self.blocked[x, y])
+
+    def get_barriers(self):
+
+        # The blocked cells as a set of cell tuples, for code that looks them up one at a time
+        cells_x, cells_y = np.nonzero(self.blocked)
+        return set(zip((cells_x + self.left).tolist(), (cells_y + self.bottom).tolist()))
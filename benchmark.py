@@ -0,0 +1,299 @@
+import argparse
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+
+# Importing headless first makes arcade run without a display
+import headless
+
+import arcade
+import darkfairy
+import settings as s
+
+GHOST_COUNTS = (10, 40, 160)
+BOSS_COUNTS = (0, 2)
+SPAWN_COUNTS = (5, 25)
+WALL_COUNTS = (s.WALL_COUNT, 2000)
+PROJECTILE_SPREAD = 1200
+SPELL_COUNTS = (0, 10)
+PLAYER_STATES = ("idle", "walking", "running", "slashing")
+
+
+def reset_field(game, seed=s.HEADLESS_SEED):
+
+    # Put the game back to a quiet field with the player in the middle of the map, so every sample starts the same
+    random.seed(seed)
+    game.ghost_pool.release_all(game.ghost_list)
+    game.swordslash_pool.release_all(game.swordslash_list)
+    game.flameslash_pool.release_all(game.flameslash_list)
+    game.spell_pool.release_all(game.dark_fairy_spell_list)
+    game.boss_list.clear()
+    if len(game.wall_list) != len(game.original_walls):
+        game.wall_list.clear()
+        game.wall_list.extend(game.original_walls)
+    game.player.position = game.map_center_x, game.map_center_y
+    game.player.change_x = 0
+    game.player.change_y = 0
+    game.player.is_walking = False
+    game.player.is_running = False
+    game.player.is_slashing = False
+    game.is_dead = False
+    game.title_screen = False
+
+
+def add_ghosts(game, count, radius):
+
+    # Scatter the ghosts around the player, inside the radius
+    for i in range(count):
+        angle = random.uniform(0, 2 * math.pi)
+        distance = random.uniform(radius / 4, radius)
+        ghost = game.ghost_pool.acquire(game.player.center_x + math.cos(angle) * distance,
+                                        game.player.center_y + math.sin(angle) * distance, s.MONSTER_SCALING)
+        ghost.change_x = random.uniform(-s.MONSTER_MOVEMENT_SPEED, s.MONSTER_MOVEMENT_SPEED)
+        ghost.change_y = random.uniform(-s.MONSTER_MOVEMENT_SPEED, s.MONSTER_MOVEMENT_SPEED)
+        game.ghost_list.append(ghost)
+
+
+def add_bosses(game, count):
+    for i in range(count):
+        boss = darkfairy.DarkFairy(game.player.center_x + random.randint(-300, 300),
+                                   game.player.center_y + random.randint(-300, 300), s.BOSS_SCALING)
+        game.boss_list.append(boss)
+
+
+# Each case takes the game and its parameters and returns a setup function that runs untimed before every sample, the
+# function to time, and how many times to call it per sample
+def bench_move_ghost(game, ghosts):
+    def setup():
+        reset_field(game)
+        add_ghosts(game, ghosts, s.MONSTER_VISION_RANGE)
+        game.flow_field.update(game.player.position)
+
+    def run():
+        for ghost in game.ghost_list:
+            game.move_ghost(ghost)
+    return setup, run, 20
+
+
+def bench_update_ghosts(game, ghosts):
+    def setup():
+        reset_field(game)
+        add_ghosts(game, ghosts, s.MONSTER_VISION_RANGE)
+
+    def run():
+        game.update_ghosts(1 / 60)
+    return setup, run, 20
+
+
+def bench_update_physics(game, ghosts, bosses):
+    def setup():
+        reset_field(game)
+        add_ghosts(game, ghosts, s.MONSTER_VISION_RANGE)
+        add_bosses(game, bosses)
+
+    def run():
+        game.update_physics(1 / 60)
+    return setup, run, 20
+
+
+def bench_update_projectiles(game, ghosts, radius=150):
+    def setup():
+        reset_field(game)
+        add_ghosts(game, ghosts, radius)
+        for ghost in game.ghost_list:
+            ghost.health = 1000
+        game.swordslash_list.append(game.swordslash_pool.acquire(game.player))
+
+    def run():
+        game.update_projectiles(1 / 60)
+    return setup, run, 5
+
+
+def bench_projectile_hits(game, ghosts, spells):
+    def setup():
+        reset_field(game)
+        add_ghosts(game, ghosts, PROJECTILE_SPREAD)
+        add_bosses(game, 1)
+        game.swordslash_list.append(game.swordslash_pool.acquire(game.player))
+
+        # Scatter the dark fairy's spells among the ghosts, enough of them to put the ghosts in a grid
+        for i in range(spells):
+            angle = random.uniform(0, 2 * math.pi)
+            distance = random.uniform(0, PROJECTILE_SPREAD)
+            spell = game.spell_pool.acquire(game.player.center_x + math.cos(angle) * distance,
+                                            game.player.center_y + math.sin(angle) * distance, s.BOSS_SCALING,
+                                            game.boss_list[0].phase)
+            game.dark_fairy_spell_list.append(spell)
+        projectiles = (*game.swordslash_list, *game.dark_fairy_spell_list)
+        game.broadphase.update({"ghosts": game.ghost_list, "bosses": game.boss_list}, len(projectiles))
+
+    def run():
+        game.broadphase.find_hits((*game.swordslash_list, *game.dark_fairy_spell_list), s.PROJECTILE_TARGETS)
+    return setup, run, 5
+
+
+def bench_player_animation(game, state):
+    def setup():
+        reset_field(game)
+        game.player.is_walking = state == "walking"
+        game.player.is_running = state == "running"
+        game.player.is_slashing = state == "slashing"
+
+    def run():
+        game.player.update_animation(1 / 60)
+    return setup, run, 100
+
+
+def bench_generate_walls(game, walls):
+    def setup():
+        reset_field(game)
+        game.wall_list.clear()
+        game.wall_list.extend(game.tile_walls)
+
+    def run():
+        game.generate_walls(walls)
+    return setup, run, 1
+
+
+def bench_spawn_ghosts(game, ghosts):
+    def setup():
+        reset_field(game)
+        game.ghosts_to_spawn = ghosts
+
+    def run():
+        game.spawn_ghosts(game.level)
+    return setup, run, 1
+
+
+# The cases and the parameters to run each of them with
+CASES = (
+    ("move_ghost", bench_move_ghost, [{"ghosts": count} for count in GHOST_COUNTS]),
+    ("update_ghosts", bench_update_ghosts, [{"ghosts": count} for count in GHOST_COUNTS]),
+    ("update_physics", bench_update_physics, [{"ghosts": ghosts, "bosses": bosses} for ghosts in GHOST_COUNTS
+                                              for bosses in BOSS_COUNTS]),
+    ("update_projectiles", bench_update_projectiles, [{"ghosts": count} for count in GHOST_COUNTS] +
+     [{"ghosts": count, "radius": PROJECTILE_SPREAD} for count in GHOST_COUNTS]),
+    ("projectile_hits", bench_projectile_hits, [{"ghosts": ghosts, "spells": spells} for ghosts in GHOST_COUNTS
+                                                for spells in SPELL_COUNTS]),
+    ("player_animation", bench_player_animation, [{"state": state} for state in PLAYER_STATES]),
+    ("generate_walls", bench_generate_walls, [{"walls": count} for count in WALL_COUNTS]),
+    ("spawn_ghosts", bench_spawn_ghosts, [{"ghosts": count} for count in SPAWN_COUNTS]),
+)
+
+
+def case_name(name, params):
+    if not params:
+        return name
+    return name + "[" + ",".join(f"{key}={value}" for key, value in params.items()) + "]"
+
+
+def time_case(setup, run, number, repeat):
+
+    # Time the calls of each sample together, the first sample is a warm up and is thrown away
+    samples = []
+    for i in range(repeat + 1):
+        setup()
+        start_time = time.perf_counter()
+        for j in range(number):
+            run()
+        samples.append((time.perf_counter() - start_time) * 1000 / number)
+    samples = samples[1:]
+    return {
+        "min_ms": min(samples),
+        "median_ms": statistics.median(samples),
+        "mean_ms": statistics.fmean(samples),
+        "stdev_ms": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "calls": number * repeat,
+    }
+
+
+def run_benchmarks(repeat=s.BENCHMARK_REPEAT, seed=s.HEADLESS_SEED, name_filter=None):
+    game = headless.make_game(seed)
+
+    # Remember the walls so the cases that change them can put them back
+    game.tile_walls = list(game.tile_wall_list)
+    game.original_walls = list(game.wall_list)
+
+    results = {}
+    for name, bench, param_sets in CASES:
+        for params in param_sets:
+            full_name = case_name(name, params)
+            if name_filter and name_filter not in full_name:
+                continue
+            results[full_name] = time_case(*bench(game, **params), repeat)
+    reset_field(game, seed)
+    game.close()
+
+    return {
+        "python": platform.python_version(),
+        "arcade": arcade.version.VERSION,
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+        "cases": results,
+    }
+
+
+def compare(report, baseline, threshold=s.BENCHMARK_REGRESSION_THRESHOLD):
+
+    # A case regresses when its median got slower than the baseline's by more than the threshold
+    comparisons = {}
+    for name, result in report["cases"].items():
+        base = baseline["cases"].get(name)
+        if base is None:
+            continue
+        ratio = result["median_ms"] / base["median_ms"] if base["median_ms"] else 1.0
+        comparisons[name] = {"baseline_ms": base["median_ms"], "median_ms": result["median_ms"], "ratio": ratio,
+                             "regressed": ratio > 1 + threshold}
+    return comparisons
+
+
+def print_report(report, comparisons=None):
+    print(f"Python {report['python']}, arcade {report['arcade']}, {report['repeat']} samples per case")
+    print(f"{'case':<44}{'median ms':>11}{'min ms':>10}{'stdev ms':>10}{'baseline':>10}{'change':>9}")
+    for name, result in report["cases"].items():
+        line = f"{name:<44}{result['median_ms']:>11.4f}{result['min_ms']:>10.4f}{result['stdev_ms']:>10.4f}"
+        comparison = (comparisons or {}).get(name)
+        if comparison:
+            line += f"{comparison['baseline_ms']:>10.4f}{comparison['ratio'] - 1:>+9.1%}"
+            if comparison["regressed"]:
+                line += "  REGRESSED"
+        print(line)
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description="Time the game's hot paths in a headless game")
+    parser.add_argument("--repeat", type=int, default=s.BENCHMARK_REPEAT, help="timed samples per case")
+    parser.add_argument("--seed", type=int, default=s.HEADLESS_SEED, help="seed for the game and the cases")
+    parser.add_argument("--filter", help="only run the cases whose name contains this")
+    parser.add_argument("--baseline", nargs="?", const=s.BENCHMARK_BASELINE,
+                        help="compare against this baseline and exit with 1 if a case regressed")
+    parser.add_argument("--save-baseline", nargs="?", const=s.BENCHMARK_BASELINE,
+                        help="save the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=s.BENCHMARK_REGRESSION_THRESHOLD,
+                        help="allowed slowdown of the median before a case counts as regressed, 0.25 is 25%%")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    return parser.parse_args(args)
+
+
+if __name__ == "__main__":
+    options = parse_args()
+    benchmark_report = run_benchmarks(options.repeat, options.seed, options.filter)
+    if options.save_baseline:
+        with open(options.save_baseline, "w") as baseline_file:
+            json.dump(benchmark_report, baseline_file, indent=2)
+    case_comparisons = None
+    if options.baseline:
+        with open(options.baseline) as baseline_file:
+            case_comparisons = compare(benchmark_report, json.load(baseline_file), options.threshold)
+        benchmark_report["comparison"] = case_comparisons
+    if options.json:
+        print(json.dumps(benchmark_report, indent=2))
+    else:
+        print_report(benchmark_report, case_comparisons)
+    if case_comparisons and any(comparison["regressed"] for comparison in case_comparisons.values()):
+        sys.exit(1)
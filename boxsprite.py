@@ -1,4 +1,5 @@
 import arcade
+from texturebank import texture_bank
 
 class BoxSprite(arcade.Sprite):
     def __init__(self, center_x, center_y,
@@ -8,4 +9,4 @@ class BoxSprite(arcade.Sprite):
         self.center_y = center_y
         self.width    = width
         self.height   = height
-        self.texture  = arcade.load_texture("assets/background.png")
+        self.texture  = texture_bank.get_texture("assets/background.png")
@@ -0,0 +1,134 @@
+import bisect
+import operator
+
+import arcade
+import numpy as np
+import settings as s
+
+# Cells are numbered row by row along y, the offset keeps the numbers positive for sprites off the bottom or left of
+# the map
+CELL_STRIDE = 1 << 20
+CELL_OFFSET = 1 << 19
+
+get_position = operator.attrgetter("position")
+get_width = operator.attrgetter("width")
+get_height = operator.attrgetter("height")
+
+
+class Layer:
+    def __init__(self, sprites, cell_size):
+
+        # The sprites of a layer sorted by the grid cell their center is in, so the sprites of a row of cells are one
+        # slice. A sprite reaches at most extent past its center whichever way it's turned, so a query looks that much
+        # further out instead of a sprite going in every cell it covers
+        self.sprites = list(sprites)
+        positions = np.array(list(map(get_position, self.sprites)), dtype=float).reshape(-1, 2)
+        cells = np.floor_divide(positions, cell_size).astype(np.int64) + CELL_OFFSET
+        keys = cells[:, 0] * CELL_STRIDE + cells[:, 1]
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order].tolist()
+        self.order = order.tolist()
+        self.extent = 0.0
+        if self.sprites:
+            self.extent = float(np.hypot(max(map(get_width, self.sprites)), max(map(get_height, self.sprites)))) / 2
+
+    def find(self, left, right, bottom, top, cell_size):
+
+        # The indexes into the layer's list of the sprites whose cells are in reach of the box, in list order. A query
+        # only looks at a few rows, which bisecting plain lists does faster than NumPy calls
+        extent = self.extent
+        first_x = int((left - extent) // cell_size) + CELL_OFFSET
+        last_x = int((right + extent) // cell_size) + CELL_OFFSET
+        first_y = int((bottom - extent) // cell_size) + CELL_OFFSET
+        last_y = int((top + extent) // cell_size) + CELL_OFFSET
+        indexes = []
+        for row in range(first_x * CELL_STRIDE, (last_x + 1) * CELL_STRIDE, CELL_STRIDE):
+            start = bisect.bisect_left(self.keys, row + first_y)
+            end = bisect.bisect_right(self.keys, row + last_y, start)
+            indexes.extend(self.order[start:end])
+        indexes.sort()
+        return indexes
+
+
+class Broadphase:
+    def __init__(self, cell_size=s.BROADPHASE_CELL_SIZE, min_projectiles=s.BROADPHASE_MIN_PROJECTILES):
+
+        # A uniform grid per layer of sprites that can be hit. The static layers are built once and again only when a
+        # sprite is taken out, the moving ones are built again every tick. Building a grid costs more than a full scan
+        # of the layer with arcade's cheap distance check does for a projectile or two, so with fewer projectiles out
+        # than min_projectiles the moving layers are scanned instead
+        self.cell_size = cell_size
+        self.min_projectiles = min_projectiles
+        self.layers = {}
+        self.sprite_lists = {}
+
+        # Stats of the last query: the pairs a full scan would test, the pairs the grid found near each other, and the
+        # ones that really touch
+        self.scan_pairs = 0
+        self.candidate_pairs = 0
+        self.hit_pairs = 0
+
+    def add_static(self, name, sprites):
+        self.sprite_lists[name] = sprites
+        self.layers[name] = Layer(sprites, self.cell_size)
+
+    def remove_static(self, name, sprites):
+        removed = set(sprites)
+        self.layers[name] = Layer([sprite for sprite in self.layers[name].sprites if sprite not in removed],
+                                  self.cell_size)
+
+    def update(self, layers, projectile_count):
+
+        # Build the moving layers again from their sprite lists, once for the whole tick, or leave them to be scanned
+        is_worth_building = projectile_count >= self.min_projectiles
+        for name, sprites in layers.items():
+            self.sprite_lists[name] = sprites
+            self.layers[name] = Layer(sprites, self.cell_size) if is_worth_building else None
+
+    def get_candidates(self, projectile, name):
+
+        # The sprites of the layer near the projectile in list order, or all of them when the layer is scanned
+        layer = self.layers.get(name)
+        if layer is None:
+            return self.sprite_lists.get(name, ())
+        sprites = layer.sprites
+        return [sprites[i] for i in layer.find(projectile.left, projectile.right, projectile.bottom, projectile.top,
+                                               self.cell_size)]
+
+    def query(self, projectiles, targets):
+
+        # The candidate pairs of every projectile with the sprites near it in the layers its type can hit, as
+        # projectile, layer name, sprite. Targets maps a projectile's type to its layers, all types go in at once
+        pairs = []
+        self.scan_pairs = 0
+        for projectile in projectiles:
+            for name in targets[projectile.type]:
+                self.scan_pairs += len(self.sprite_lists.get(name, ()))
+                pairs.extend((projectile, name, sprite) for sprite in self.get_candidates(projectile, name))
+        self.candidate_pairs = len(pairs)
+        return pairs
+
+    def find_hits(self, projectiles, targets):
+
+        # The pairs of the query that really touch, tested the same way arcade.check_for_collision_with_list does. A
+        # scanned layer goes straight to it, that's what testing every sprite costs anyway
+        hits = []
+        self.scan_pairs = 0
+        self.candidate_pairs = 0
+        for projectile in projectiles:
+            for name in targets[projectile.type]:
+                sprites = self.sprite_lists.get(name, ())
+                self.scan_pairs += len(sprites)
+                if self.layers.get(name) is None:
+                    self.candidate_pairs += len(sprites)
+                    touching = arcade.check_for_collision_with_list(projectile, sprites) if sprites else []
+                else:
+                    candidates = self.get_candidates(projectile, name)
+                    self.candidate_pairs += len(candidates)
+                    touching = [sprite for sprite in candidates if arcade.check_for_collision(projectile, sprite)]
+                hits.extend((projectile, name, sprite) for sprite in touching)
+        self.hit_pairs = len(hits)
+        return hits
+
+    def stats(self):
+        return {"scan_pairs": self.scan_pairs, "candidate_pairs": self.candidate_pairs, "hit_pairs": self.hit_pairs}
@@ -0,0 +1,123 @@
+import argparse
+import glob
+import json
+import math
+import os
+import time
+
+import arcade
+from arcade.texture import ImageData
+from PIL import Image
+import player
+import settings as s
+from texturebank import texture_bank
+
+# The directories of animation frames that are packed, every png under them goes in
+ATLAS_SOURCE_DIRECTORIES = ("assets/player", "assets/enemies", "assets/projectiles", "assets/heart", "assets/altar")
+
+
+def find_images(directories=ATLAS_SOURCE_DIRECTORIES):
+    file_paths = []
+    for directory in directories:
+        file_paths.extend(sorted(glob.glob(f"{directory}/**/*.png", recursive=True)))
+    return [file_path.replace(os.sep, "/") for file_path in file_paths]
+
+
+def pack(sizes, page_size):
+
+    # Shelf packing, tallest images first: fill a row left to right, start a new row above it when the width runs out
+    # and a new page when the height does. Returns the page, x and y of every size in the order they were given
+    order = sorted(range(len(sizes)), key=lambda i: (sizes[i][1], sizes[i][0]), reverse=True)
+    places = [None] * len(sizes)
+    page = x = y = row_height = 0
+    for i in order:
+        width, height = sizes[i]
+        if width > page_size[0] or height > page_size[1]:
+            raise ValueError(f"A {width}x{height} image doesn't fit on a {page_size[0]}x{page_size[1]} atlas page")
+        if x + width > page_size[0]:
+            x, y, row_height = 0, y + row_height, 0
+        if y + height > page_size[1]:
+            page, x, y, row_height = page + 1, 0, 0, 0
+        places[i] = page, x, y
+        x += width
+        row_height = max(row_height, height)
+    return places
+
+
+def get_preload_sizes(sizes):
+
+    # The sizes of the textures the game preloads, by the packed sizes or from the files that aren't packed. The ones
+    # it loads on first use or never aren't counted, the atlas grows for those if they're ever asked for
+    file_paths = set().union(*texture_bank.get_preload_paths(player.LAZY_ANIMATIONS).values())
+    return [sizes[file_path] if file_path in sizes else Image.open(file_path).size for file_path in sorted(file_paths)]
+
+
+def round_up(length, step=s.ATLAS_SIZE_STEP):
+    return math.ceil(length / step) * step
+
+
+def get_atlas_size(sizes, border=1):
+
+    # About the smallest atlas the game can hold the textures in, with its border around each one and some room for
+    # the packing not being perfect. It's close to square but neither side has to be a power of two, and it's at least
+    # as wide as the widest texture
+    area = sum((width + border * 2) * (height + border * 2) for width, height in sizes) * s.ATLAS_PACKING_SLACK
+    widest = max((width + border * 2 for width, height in sizes), default=0)
+    width = min(max(round_up(math.sqrt(area)), round_up(widest)), s.ATLAS_MAX_SIZE)
+    height = min(round_up(area / width), s.ATLAS_MAX_SIZE)
+    return width, height
+
+
+def build_atlas(directories=ATLAS_SOURCE_DIRECTORIES, output_directory=s.ATLAS_DIRECTORY,
+                page_size=(s.ATLAS_PAGE_SIZE, s.ATLAS_PAGE_SIZE)):
+    file_paths = find_images(directories)
+    images = []
+    for file_path in file_paths:
+        image = Image.open(file_path)
+        images.append(image if image.mode == "RGBA" else image.convert("RGBA"))
+    places = pack([image.size for image in images], page_size)
+
+    # Paste the images onto their pages, and keep the hash and hit box arcade would work out when loading each one on
+    # its own so the game doesn't have to
+    pages = [Image.new("RGBA", page_size) for _ in range(max(place[0] for place in places) + 1)]
+    textures = {}
+    for file_path, image, (page, x, y) in zip(file_paths, images, places):
+        pages[page].paste(image, (x, y))
+        textures[file_path] = {
+            "page": page,
+            "region": [x, y, image.width, image.height],
+            "hash": ImageData.calculate_hash(image),
+            "hit_box": [list(point) for point in arcade.hitbox.algo_default.calculate(image)],
+        }
+
+    os.makedirs(output_directory, exist_ok=True)
+    page_names = []
+    for i, page in enumerate(pages):
+        page_names.append(f"page-{i}.png")
+        page.save(os.path.join(output_directory, page_names[-1]))
+    manifest = {
+        "page_size": list(page_size),
+        "pages": page_names,
+        "atlas_size": list(get_atlas_size(get_preload_sizes({file_path: image.size for file_path, image in
+                                                             zip(file_paths, images)}))),
+        "textures": textures,
+    }
+    with open(os.path.join(output_directory, "manifest.json"), "w") as manifest_file:
+        json.dump(manifest, manifest_file)
+    return manifest
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description="Pack the animation frames into atlas pages with a manifest")
+    parser.add_argument("--output", default=s.ATLAS_DIRECTORY, help="directory the pages and manifest go in")
+    parser.add_argument("--page-size", type=int, default=s.ATLAS_PAGE_SIZE, help="width and height of each page")
+    return parser.parse_args(args)
+
+
+if __name__ == "__main__":
+    options = parse_args()
+    start_time = time.perf_counter()
+    atlas_manifest = build_atlas(output_directory=options.output, page_size=(options.page_size, options.page_size))
+    print(f"Packed {len(atlas_manifest['textures'])} images into {len(atlas_manifest['pages'])} pages in "
+          f"{options.output} in {time.perf_counter() - start_time:.1f} s, the game's atlas will be "
+          f"{atlas_manifest['atlas_size'][0]}x{atlas_manifest['atlas_size'][1]}")
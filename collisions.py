@@ -0,0 +1,246 @@
+import arcade
+import numpy as np
+import settings as s
+
+
+def push_apart(sprite, other, share=1.0):
+
+    # Push the sprite out of the other sprite along the axis it is least stuck in
+    push_left = sprite.right - other.left
+    push_right = other.right - sprite.left
+    push_down = sprite.top - other.bottom
+    push_up = other.top - sprite.bottom
+    smallest = min(push_left, push_right, push_down, push_up)
+    if smallest == push_left:
+        sprite.center_x -= push_left * share
+    elif smallest == push_right:
+        sprite.center_x += push_right * share
+    elif smallest == push_down:
+        sprite.center_y -= push_down * share
+    else:
+        sprite.center_y += push_up * share
+
+
+def get_bounds(sprites):
+
+    # The left, right, bottom and top of every sprite's hit box, one row each. arcade works the hit box points out
+    # again on every read of a bound, so they are read once per sprite here instead of once per pair
+    bounds = np.empty((len(sprites), 4))
+    for i, sprite in enumerate(sprites):
+        xs, ys = zip(*sprite.hit_box.get_adjusted_points())
+        bounds[i] = min(xs), max(xs), min(ys), max(ys)
+    return bounds
+
+
+def find_overlaps(bounds, other_bounds):
+
+    # The pairs of rows of the two bound arrays that overlap, as two index arrays. The others are sorted by their left
+    # edges, so only the ones whose left edge is within the widest of them of a box are tested
+    if not len(bounds) or not len(other_bounds):
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+    order = np.argsort(other_bounds[:, 0], kind="stable")
+    lefts = other_bounds[order, 0]
+    widest = float((other_bounds[:, 1] - other_bounds[:, 0]).max())
+    starts = np.searchsorted(lefts, bounds[:, 0] - widest, "right")
+    counts = np.maximum(np.searchsorted(lefts, bounds[:, 1], "left") - starts, 0)
+    firsts = np.repeat(np.arange(len(bounds)), counts)
+    offsets = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+    seconds = order[starts[firsts] + offsets]
+    first, second = bounds[firsts], other_bounds[seconds]
+    touching = (first[:, 0] < second[:, 1]) & (first[:, 1] > second[:, 0]) & \
+               (first[:, 2] < second[:, 3]) & (first[:, 3] > second[:, 2])
+    return firsts[touching], seconds[touching]
+
+
+def get_push(bounds, other_bounds):
+
+    # How far to move the first box to get it out of the second along the axis it is least stuck in, the same way
+    # push_apart does
+    left, right, bottom, top = bounds
+    other_left, other_right, other_bottom, other_top = other_bounds
+    push_left = right - other_left
+    push_right = other_right - left
+    push_down = top - other_bottom
+    push_up = other_top - bottom
+    smallest = min(push_left, push_right, push_down, push_up)
+    if smallest == push_left:
+        return -push_left, 0.0
+    if smallest == push_right:
+        return push_right, 0.0
+    if smallest == push_down:
+        return 0.0, -push_down
+    return 0.0, push_up
+
+
+def move_bounds(bounds, x, y):
+    bounds[0] += x
+    bounds[1] += x
+    bounds[2] += y
+    bounds[3] += y
+
+
+class CollisionEngine:
+    def __init__(self, player, wall_list, secret_door_list, ghost_list, boss_list,
+                 cell_size=s.COLLISION_CELL_SIZE):
+
+        # The bodies the engine resolves, these lists are shared with the game
+        self.player = player
+        self.wall_list = wall_list
+        self.secret_door_list = secret_door_list
+        self.ghost_list = ghost_list
+        self.boss_list = boss_list
+
+        # Walls don't move so they are hashed once, ghosts have their bounds read into an array once every tick and
+        # only block a body they are within its move of. There are only ever a handful of bosses so they are just
+        # checked directly
+        self.wall_hash = arcade.SpatialHash(cell_size)
+        for wall in self.wall_list:
+            self.wall_hash.add(wall)
+        self.wall_bounds = None
+        self.ghosts = []
+        self.ghost_bounds = get_bounds(self.ghosts)
+
+        # The contact pairs found during the last tick, and how many tuned ticks long it was
+        self.contacts = []
+        self.tick_scale = 1.0
+        self.pairs_checked = 0
+
+    def add_wall(self, wall):
+        self.wall_hash.add(wall)
+        self.wall_bounds = None
+
+    def remove_wall(self, wall):
+        self.wall_hash.remove(wall)
+        self.wall_bounds = None
+
+    def update(self, is_player_alive=True, is_door_closed=True, delta_time=1 / 60):
+        self.contacts = []
+        self.pairs_checked = 0
+        self.tick_scale = delta_time * s.TUNED_TICK_RATE
+
+        # Read the ghosts' bounds once for the whole tick, they don't move until they're pushed at the end
+        self.ghosts = list(self.ghost_list)
+        self.ghost_bounds = get_bounds(self.ghosts)
+
+        # The player used to be moved by one physics engine per thing that could block it and the movement speeds
+        # are tuned around that, so keep stepping it once per blocker
+        player_steps = len(self.boss_list)
+        if is_player_alive:
+            player_steps += 2
+            if is_door_closed:
+                player_steps += 1
+        for i in range(player_steps):
+            self.move_body(self.player, is_player_alive, is_door_closed)
+
+        # Bosses only get blocked by the walls
+        for boss in self.boss_list:
+            self.move_body(boss, False, False)
+
+        # Ghosts are already moved by their own update, so just push them out of whatever they ended up inside
+        self.push_ghosts()
+        return self.contacts
+
+    def push_ghosts(self):
+
+        # Every body's bounds are read once into arrays, the walls only when they change. The pairs that overlap are
+        # found with NumPy, then pushed apart one ghost at a time in list order, walls first, then ghosts, then
+        # bosses. Each pair is only tested again against the bounds the pushes so far left it with
+        ghosts = self.ghosts
+        if not ghosts:
+            return
+        if self.wall_bounds is None:
+            self.wall_bounds = get_bounds(self.wall_list)
+        walls = list(self.wall_list)
+        bosses = list(self.boss_list)
+        ghost_bounds = self.ghost_bounds
+        boss_bounds = get_bounds(bosses)
+
+        # A pair of ghosts is only visited from the first of the two, and both of them are pushed half the way
+        wall_firsts, wall_seconds = find_overlaps(ghost_bounds, self.wall_bounds)
+        ghost_firsts, ghost_seconds = find_overlaps(ghost_bounds, ghost_bounds)
+        is_later = ghost_seconds > ghost_firsts
+        ghost_firsts, ghost_seconds = ghost_firsts[is_later], ghost_seconds[is_later]
+        boss_firsts, boss_seconds = find_overlaps(ghost_bounds, boss_bounds)
+        firsts = np.concatenate((wall_firsts, ghost_firsts, boss_firsts))
+        kinds = np.repeat([0, 1, 2], [len(wall_firsts), len(ghost_firsts), len(boss_firsts)])
+        seconds = np.concatenate((wall_seconds, ghost_seconds, boss_seconds))
+        order = np.lexsort((seconds, kinds, firsts))
+        self.pairs_checked += len(order)
+
+        bounds = ghost_bounds.tolist()
+        others = (self.wall_bounds.tolist(), bounds, boss_bounds.tolist())
+        bodies = (walls, ghosts, bosses)
+        moved = {}
+        for first, kind, second in zip(firsts[order].tolist(), kinds[order].tolist(), seconds[order].tolist()):
+            box, other_box = bounds[first], others[kind][second]
+            if not (box[0] < other_box[1] and box[1] > other_box[0] and box[2] < other_box[3] and
+                    box[3] > other_box[2]):
+                continue
+            x, y = get_push(box, other_box)
+            if kind == 1:
+                x, y = x * 0.5, y * 0.5
+                move_bounds(other_box, -x, -y)
+                moved[second] = True
+            move_bounds(box, x, y)
+            moved[first] = True
+            self.contacts.append((ghosts[first], bodies[kind][second]))
+
+        # Move the pushed ghosts by as much as their bounds moved
+        for i in moved:
+            ghost = ghosts[i]
+            ghost.position = (ghost.center_x + bounds[i][0] - ghost_bounds[i, 0],
+                              ghost.center_y + bounds[i][2] - ghost_bounds[i, 2])
+
+    def get_blockers(self, sprite, include_ghosts, include_door):
+        blockers = list(self.wall_hash.get_sprites_near_sprite(sprite))
+        if include_door:
+            blockers.extend(self.secret_door_list)
+        if include_ghosts:
+            reach = (abs(sprite.change_x) + abs(sprite.change_y)) * self.tick_scale
+            near_box = get_bounds([sprite]) + (-reach, reach, -reach, reach)
+            blockers.extend(self.ghosts[i] for i in find_overlaps(near_box, self.ghost_bounds)[1].tolist())
+        if sprite is self.player:
+            blockers.extend(self.boss_list)
+        return blockers
+
+    def get_hits(self, sprite, blockers):
+        left, right, bottom, top = get_bounds([sprite])[0].tolist()
+        hits = []
+        for blocker in blockers:
+            self.pairs_checked += 1
+            if left < blocker.right and right > blocker.left and bottom < blocker.top and top > blocker.bottom:
+                hits.append(blocker)
+        return hits
+
+    def move_body(self, sprite, include_ghosts, include_door):
+        blockers = self.get_blockers(sprite, include_ghosts, include_door)
+
+        # Get out of anything we were already stuck in before moving
+        for blocker in self.get_hits(sprite, blockers):
+            push_apart(sprite, blocker)
+            self.contacts.append((sprite, blocker))
+
+        # Move in the y direction, then line our edge up with whatever we hit
+        if sprite.change_y:
+            sprite.center_y += sprite.change_y * self.tick_scale
+            hits = self.get_hits(sprite, blockers)
+            if hits:
+                if sprite.change_y > 0:
+                    sprite.top = min(hit.bottom for hit in hits)
+                else:
+                    sprite.bottom = max(hit.top for hit in hits)
+                self.contacts.extend((sprite, hit) for hit in hits)
+
+        # Then do the same in the x direction
+        if sprite.change_x:
+            sprite.center_x += sprite.change_x * self.tick_scale
+            hits = self.get_hits(sprite, blockers)
+            if hits:
+                if sprite.change_x > 0:
+                    sprite.right = min(hit.left for hit in hits)
+                else:
+                    sprite.left = max(hit.right for hit in hits)
+                self.contacts.extend((sprite, hit) for hit in hits)
+
+    def stats(self):
+        return {"contacts": len(self.contacts), "pairs_checked": self.pairs_checked}
@@ -0,0 +1,100 @@
+import math
+
+import arcade
+import settings as s
+
+
+def get_view_rect(camera, margin=s.CULL_MARGIN):
+
+    # The world area the camera shows as left, right, bottom, top. It's grown by a margin so sprites that are only
+    # partly on the screen, or only have their center just off it, still get drawn
+    x, y = camera.position
+    left, right, bottom, top = camera.projection.lrbt
+    zoom = camera.zoom
+    return (x + left / zoom - margin, x + right / zoom + margin,
+            y + bottom / zoom - margin, y + top / zoom + margin)
+
+
+class ChunkedSpriteList:
+    def __init__(self, sprite_list, chunk_size=s.CULL_CHUNK_SIZE):
+
+        # Sprites that don't move are sorted once into square chunks by their center, then only the chunks the view
+        # touches are drawn. Sprites removed from the game leave the chunks on their own, when the count changes
+        # otherwise the chunks are rebuilt
+        self.sprite_list = sprite_list
+        self.chunk_size = chunk_size
+        self.chunks = {}
+        self.indexed_count = -1
+
+    def rebuild(self):
+        self.chunks = {}
+        for sprite in self.sprite_list:
+            key = (math.floor(sprite.center_x / self.chunk_size), math.floor(sprite.center_y / self.chunk_size))
+            chunk = self.chunks.get(key)
+            if chunk is None:
+                chunk = self.chunks[key] = arcade.SpriteList()
+            chunk.append(sprite)
+        self.indexed_count = len(self.sprite_list)
+
+    def draw(self, view):
+
+        # Draw the chunks under the view, returns how many sprites were drawn
+        if len(self.sprite_list) != self.indexed_count:
+            self.rebuild()
+        left, right, bottom, top = view
+        visible = 0
+        for chunk_x in range(math.floor(left / self.chunk_size), math.floor(right / self.chunk_size) + 1):
+            for chunk_y in range(math.floor(bottom / self.chunk_size), math.floor(top / self.chunk_size) + 1):
+                chunk = self.chunks.get((chunk_x, chunk_y))
+                if chunk is not None:
+                    chunk.draw()
+                    visible += len(chunk)
+        return visible
+
+
+class Culler:
+    def __init__(self, enabled=s.CULL_ENABLED):
+        self.enabled = enabled
+        self.view = (0.0, 0.0, 0.0, 0.0)
+
+        # The chunked lists of the still sprites and the lists the moving sprites on screen are gathered in, by name
+        self.chunked_lists = {}
+        self.visible_lists = {}
+
+        # How many sprites of each list were drawn in the last frame, and how many there were
+        self.counts = {}
+
+    def update(self, camera):
+        self.view = get_view_rect(camera)
+
+    def draw_still(self, name, sprite_list):
+        if not self.enabled:
+            sprite_list.draw()
+            self.counts[name] = (len(sprite_list), len(sprite_list))
+            return
+        chunked_list = self.chunked_lists.get(name)
+        if chunked_list is None or chunked_list.sprite_list is not sprite_list:
+            chunked_list = self.chunked_lists[name] = ChunkedSpriteList(sprite_list)
+        self.counts[name] = (chunked_list.draw(self.view), len(sprite_list))
+
+    def draw_moving(self, name, sprite_list):
+        if not self.enabled:
+            sprite_list.draw()
+            self.counts[name] = (len(sprite_list), len(sprite_list))
+            return
+
+        # Moving sprites can't be chunked, but there are few enough of them to check each one against the view and
+        # gather the ones on screen into a list that is drawn instead
+        visible_list = self.visible_lists.get(name)
+        if visible_list is None:
+            visible_list = self.visible_lists[name] = arcade.SpriteList()
+        visible_list.clear()
+        left, right, bottom, top = self.view
+        for sprite in sprite_list:
+            if sprite.right > left and sprite.left < right and sprite.top > bottom and sprite.bottom < top:
+                visible_list.append(sprite)
+        visible_list.draw()
+        self.counts[name] = (len(visible_list), len(sprite_list))
+
+    def get_report(self):
+        return ", ".join(f"{name} {visible}/{total}" for name, (visible, total) in self.counts.items())
@@ -1,46 +1,45 @@
 import arcade
+import settings as s
+from animation import Animator
+from pools import PooledSprite
 
 
-class DarkFairySpell(arcade.Sprite):
-    def __init__(self, center_x, center_y, scale, DarkFairy):
+class DarkFairySpell(PooledSprite, arcade.Sprite):
+    def __init__(self, center_x, center_y, scale, phase=1):
         super().__init__()
 
+        # Init the animation, the spell is gone once it has played through
+        self.animator = Animator("darkfairy_spell", "phase_1")
+        self.min_spawn_distance = 90
+        self.movement_speed_modifier = 2.5
+
+        # Set the type
+        self.type = "spell"
+        self.reset(center_x, center_y, scale, phase)
+
+    def reset(self, center_x, center_y, scale, phase=1):
+
         # Init sprite properties
         self.center_x = center_x
         self.center_y = center_y
+        self.change_x, self.change_y = 0, 0
         self.scale = scale
-        self.phase = DarkFairy.phase
-
-        # Init animation frames
-        self.phase_1_frames = []
-        self.current_frame = 0
-        self.update_interval = 8
-        self.min_spawn_distance = 90
-        self.movement_speed_modifier = 2.5
+        self.phase = phase
+        self.animator.play("phase_1", restart=True)
+        self.has_turned = False
         self.current_path_position = 0
-        self.load_frames()
         self.damage = self.phase
 
-        # Set the type
-        self.type = "spell"
-
         # Pathfinding parameters
         self.path = None
 
-        self.texture = self.phase_1_frames[0]
-
-    def load_frames(self):
-        for i in range(0, 12):
-            self.phase_1_frames.append(arcade.load_texture(
-                f"assets/projectiles/darkfairy_spells/darkfairy_phase1_spell_0-{i}.png"))
+        self.texture = self.animator.get_texture()
 
     def update(self, delta_time: float = 1 / 60):
-        self.center_x += self.change_x
-        self.center_y += self.change_y
+        self.center_x += self.change_x * delta_time * s.TUNED_TICK_RATE
+        self.center_y += self.change_y * delta_time * s.TUNED_TICK_RATE
 
     def update_animation(self, delta_time: float = 1 / 60):
-        self.current_frame += delta_time * self.update_interval
-        try:
-            self.texture = self.phase_1_frames[int(self.current_frame)]
-        except IndexError:
+        self.texture = self.animator.update(delta_time)
+        if self.animator.is_finished:
             self.kill()
@@ -0,0 +1,120 @@
+import time
+
+import numpy as np
+import pathfinding
+
+
+class FlowField:
+    def __init__(self, barrier_grid, pool=None):
+
+        # Copy the grid from the barrier grid so every ghost can share it, and work it out again when cells change
+        self.grid_size = barrier_grid.grid_size
+        self.left = barrier_grid.left
+        self.right = barrier_grid.right
+        self.bottom = barrier_grid.bottom
+        self.top = barrier_grid.top
+        self.barrier_grid = barrier_grid
+        barrier_grid.subscribe(self.on_barriers_changed)
+
+        # The goal cell, the distance of every cell to it with -1 where it can't be reached, and the position of the
+        # next cell to step to from each cell with NaN where there is none, all indexed by cell
+        self.goal = None
+        self.distances = np.full((self.right - self.left + 1, self.top - self.bottom + 1), -1, dtype=np.int32)
+        self.next_x = np.full(self.distances.shape, np.nan)
+        self.next_y = np.full_like(self.next_x, np.nan)
+
+        # With a pathfinding pool the fields are solved in its workers, the ghosts keep following the last field until
+        # the one for the goal they asked for arrives. The sequence tells a newer result from an older one
+        self.pool = pool
+        self.requested_goal = None
+        self.installed_sequence = 0
+        if pool is not None:
+            pool.set_grid(self.get_grid())
+
+        # Stats
+        self.recalculations = 0
+        self.last_recalculation_time = 0.0
+
+    def get_grid(self):
+
+        # The grid as the pathfinding workers take it, a copy so it can't change under them
+        return self.barrier_grid.blocked.copy(), self.left, self.bottom, self.grid_size
+
+    def on_barriers_changed(self, region):
+
+        # Any change can open or close a way to the goal, so the next update searches again from scratch
+        self.goal = None
+        self.requested_goal = None
+        if self.pool is not None:
+            self.pool.set_grid(self.get_grid())
+
+    def to_cell(self, position):
+        return int(position[0] // self.grid_size), int(position[1] // self.grid_size)
+
+    def to_index(self, cell):
+        x, y = cell[0] - self.left, cell[1] - self.bottom
+        if 0 <= x < self.distances.shape[0] and 0 <= y < self.distances.shape[1]:
+            return x, y
+        return None
+
+    def update(self, goal_position):
+        goal = self.to_cell(goal_position)
+
+        # Without a pool, or before there is any field to follow, the field is solved here and now
+        if self.pool is None or not self.recalculations:
+            if goal == self.goal:
+                return False
+            self.recalculate(goal)
+            return True
+
+        # Ask the pool for a new goal once, and take the newest result it hands back if it's newer than the field
+        if goal != self.requested_goal:
+            self.requested_goal = goal
+            self.pool.request(goal)
+        results = self.pool.collect()
+        if self.pool.is_broken:
+
+            # The pool's workers failed, so solve the fields here from now on
+            self.pool = None
+            return self.update(goal_position)
+        for sequence, result in results:
+            if sequence > self.installed_sequence:
+                self.installed_sequence = sequence
+                self.install(result)
+                return True
+        return False
+
+    def recalculate(self, goal):
+        start_time = time.perf_counter()
+        self.install(pathfinding.solve(goal, self.get_grid()))
+        self.last_recalculation_time = time.perf_counter() - start_time
+
+    def install(self, result):
+        self.goal, self.distances, self.next_x, self.next_y = result
+        self.recalculations += 1
+
+    def next_step(self, position):
+
+        # Returns the point to move towards, or None if we are already in the goal cell or can't reach it
+        index = self.to_index(self.to_cell(position))
+        if index is None or np.isnan(self.next_x[index]):
+            return None
+        return int(self.next_x[index]), int(self.next_y[index])
+
+    def next_steps(self, xs, ys):
+
+        # Vectorized next_step for arrays of positions, the result is NaN where next_step would return None
+        cell_xs = np.floor_divide(xs, self.grid_size).astype(int) - self.left
+        cell_ys = np.floor_divide(ys, self.grid_size).astype(int) - self.bottom
+        inside = (cell_xs >= 0) & (cell_xs < self.next_x.shape[0]) & (cell_ys >= 0) & (cell_ys < self.next_x.shape[1])
+        next_xs = np.full(len(xs), np.nan)
+        next_ys = np.full(len(ys), np.nan)
+        next_xs[inside] = self.next_x[cell_xs[inside], cell_ys[inside]]
+        next_ys[inside] = self.next_y[cell_xs[inside], cell_ys[inside]]
+        return next_xs, next_ys
+
+    def distance(self, position):
+        index = self.to_index(self.to_cell(position))
+        if index is None or self.distances[index] < 0:
+            return None
+        return int(self.distances[index])
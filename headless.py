@@ -0,0 +1,173 @@
+import argparse
+import json
+import os
+import random
+import time
+
+# Run pyglet without a display, this has to be set before arcade is imported
+os.environ.setdefault("ARCADE_HEADLESS", "1")
+
+import arcade
+
+import main
+import settings as s
+
+# The phases of MyGame.on_update, in the order it runs them
+UPDATE_PHASES = ("update_physics", "update_movement", "update_projectiles", "update_secret_door", "update_music",
+                 "update_player", "update_gui", "update_ghosts", "update_bosses", "update_altar")
+
+# The game treats timers at 0 as unset and compares other timers against 0, so start far from it like time.time()
+SIMULATED_CLOCK_START = 1_000_000.0
+
+
+class SimulatedClock:
+    def __init__(self, start=SIMULATED_CLOCK_START):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, delta_time):
+        self.now += delta_time
+
+
+class PhaseTimer:
+    def __init__(self, game, phases=UPDATE_PHASES):
+        self.totals = dict.fromkeys(phases, 0.0)
+        self.maximums = dict.fromkeys(phases, 0.0)
+
+        # Shadow each phase method with a timed version, on_update calls them through self so it picks these up
+        for phase in phases:
+            setattr(game, phase, self.wrap(phase, getattr(game, phase)))
+
+    def wrap(self, phase, method):
+        def timed_phase(*args):
+            start_time = time.perf_counter()
+            result = method(*args)
+            elapsed = time.perf_counter() - start_time
+            self.totals[phase] += elapsed
+            if elapsed > self.maximums[phase]:
+                self.maximums[phase] = elapsed
+            return result
+        return timed_phase
+
+    def report(self, ticks):
+        return {phase: {"total_ms": total * 1000,
+                        "mean_ms": total * 1000 / max(ticks, 1),
+                        "max_ms": self.maximums[phase] * 1000} for phase, total in self.totals.items()}
+
+
+def load_input_script(file_path):
+
+    # The script is a list of events like {"tick": 0, "press": ["UP", "C"]} or {"tick": 90, "release": ["UP"]}, keys
+    # are named the same as in arcade.key
+    with open(file_path) as file:
+        events = json.load(file)
+    script = {}
+    for event in events:
+        for action in ("press", "release"):
+            for key_name in event.get(action, ()):
+                try:
+                    key = getattr(arcade.key, key_name.upper())
+                except AttributeError:
+                    raise ValueError(f"Unknown key '{key_name}' at tick {event['tick']} in {file_path}") from None
+                script.setdefault(int(event["tick"]), []).append((action, key))
+    return script
+
+
+def make_game(seed=s.HEADLESS_SEED, clock=None):
+
+    # Seed everything before the game is made, the walls and the first ghosts are placed at random. The flow field is
+    # solved in the game itself, the worker pool hands fields back whenever they're done which a replay can't repeat
+    random.seed(seed)
+    game = main.MyGame(s.SCREEN_WIDTH, s.SCREEN_HEIGHT, s.SCREEN_TITLE, clock=clock or SimulatedClock(),
+                       pathfinding_workers=s.HEADLESS_PATHFINDING_WORKERS)
+    game.ghost_swarm.seed(seed)
+    return game
+
+
+def run_simulation(ticks=s.HEADLESS_TICKS, delta_time=s.HEADLESS_DELTA_TIME, seed=s.HEADLESS_SEED,
+                   input_script=None, skip_title_screen=True, draw=False):
+    clock = SimulatedClock()
+    game = make_game(seed, clock)
+    game.title_screen = not skip_title_screen
+    phase_timer = PhaseTimer(game)
+    input_script = input_script or {}
+    draw_time = 0.0
+
+    start_time = time.perf_counter()
+    for tick in range(ticks):
+
+        # Feed the scripted input through the key handlers so releases reset the player like real ones do
+        for action, key in input_script.get(tick, ()):
+            if action == "press":
+                game.on_key_press(key, 0)
+            else:
+                game.on_key_release(key, 0)
+
+        game.on_update(delta_time)
+        clock.advance(delta_time)
+        if draw:
+            draw_start_time = time.perf_counter()
+            game.on_draw()
+            draw_time += time.perf_counter() - draw_start_time
+    elapsed = time.perf_counter() - start_time
+
+    report = {
+        "ticks": ticks,
+        "delta_time": delta_time,
+        "seed": seed,
+        "seconds": elapsed,
+        "ticks_per_second": ticks / elapsed if elapsed else 0.0,
+        "phases": phase_timer.report(ticks),
+        "startup": game.startup_report,
+        "state": {
+            "score": game.score,
+            "health": game.health,
+            "level": game.level,
+            "ghosts": len(game.ghost_list),
+            "bosses": len(game.boss_list),
+            "player": list(game.player.position),
+        },
+    }
+    if draw:
+        report["draw_ms"] = draw_time * 1000 / max(ticks, 1)
+    game.close()
+    return report
+
+
+def print_report(report):
+    print(f"{report['ticks']} ticks of {report['delta_time'] * 1000:.2f} ms with seed {report['seed']} "
+          f"in {report['seconds']:.2f} s, {report['ticks_per_second']:.1f} ticks/s")
+    print(f"{'phase':<20}{'mean ms':>10}{'max ms':>10}{'total ms':>12}{'share':>8}")
+    total = sum(phase["total_ms"] for phase in report["phases"].values()) or 1
+    for name, phase in report["phases"].items():
+        print(f"{name:<20}{phase['mean_ms']:>10.3f}{phase['max_ms']:>10.3f}{phase['total_ms']:>12.1f}"
+              f"{phase['total_ms'] / total:>8.1%}")
+    if "draw_ms" in report:
+        print(f"{'on_draw':<20}{report['draw_ms']:>10.3f}")
+    print("state:", json.dumps(report["state"]))
+    print("startup:", ", ".join(f"{name} {milliseconds:.1f} ms" for name, milliseconds in report["startup"].items()))
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description="Run the game update loop headless at full speed with a fixed step")
+    parser.add_argument("--ticks", type=int, default=s.HEADLESS_TICKS, help="number of updates to run")
+    parser.add_argument("--dt", type=float, default=s.HEADLESS_DELTA_TIME, help="fixed delta time of every update")
+    parser.add_argument("--seed", type=int, default=s.HEADLESS_SEED, help="seed for every random number generator")
+    parser.add_argument("--input", help="JSON input script of key presses and releases by tick")
+    parser.add_argument("--title-screen", action="store_true", help="start on the title screen like the real game")
+    parser.add_argument("--draw", action="store_true", help="also draw every tick to the offscreen window")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    return parser.parse_args(args)
+
+
+if __name__ == "__main__":
+    options = parse_args()
+    simulation_report = run_simulation(options.ticks, options.dt, options.seed,
+                                       load_input_script(options.input) if options.input else None,
+                                       not options.title_screen, options.draw)
+    if options.json:
+        print(json.dumps(simulation_report, indent=2))
+    else:
+        print_report(simulation_report)
@@ -0,0 +1,48 @@
+import arcade
+import pyglet
+import settings as s
+
+
+class Hud:
+    def __init__(self, width=s.SCREEN_WIDTH, height=s.SCREEN_HEIGHT):
+
+        # Every text lives in one batch for the whole game and is only re-laid out when its value changes, an empty
+        # text is a hidden one
+        self.batch = pyglet.graphics.Batch()
+        self.texts = {}
+        self.updates = 0
+
+        # The counters in the corner
+        self.add("ghosts", 40, 70, 19)
+        self.add("score", 40, 32, 19)
+
+        # The title and game over screens
+        self.add("title", width / 2, height / 2 + 50, 72, anchor_x="center", bold=True)
+        self.add("start", width / 2, height / 2 - 100, 36, anchor_x="center")
+        self.add("game_over", width / 2, height / 2 + 50, 72, anchor_x="center", bold=True)
+        self.add("restart", width / 2, height / 2 - 100, 36, anchor_x="center")
+
+        # The debug lines
+        self.add("culling", 40, 1054, 19)
+        self.add("render_scale", 40, 1024, 19)
+        self.add("ghost_pool", 40, 994, 19)
+        self.add("pathfinding", 960, 1054, 19)
+        self.add("broadphase", 960, 1024, 19)
+        self.add("player_position", 40, 934, 19)
+        self.add("ghosts_hunting", 40, 964, 19)
+        for i in range(s.HUD_DEBUG_GHOSTS):
+            self.add(f"ghost_{i}_velocity", 40, 904 - (i * 30 * 2), 19)
+            self.add(f"ghost_{i}_position", 90, 874 - (i * 30 * 2), 19)
+
+    def add(self, name, x, y, font_size, **kwargs):
+        self.texts[name] = arcade.Text("", x, y, s.HUD_TEXT_COLOR, font_size, font_name=s.HUD_FONT,
+                                       batch=self.batch, **kwargs)
+
+    def set(self, name, value):
+        text = self.texts[name]
+        if text.text != value:
+            text.text = value
+            self.updates += 1
+
+    def draw(self):
+        self.batch.draw()
@@ -0,0 +1,201 @@
+import argparse
+import json
+import math
+import os
+import random
+import time
+
+import arcade
+import numpy as np
+import settings as s
+from texturebank import texture_bank
+
+# Tiled keeps the flip flags in the top bits of every tile id
+TILE_ID_MASK = 0x1FFFFFFF
+
+
+def load_tiled_map(map_path):
+
+    # Read a Tiled JSON map into the tile ids of every tile layer, as one array of layers by rows by columns with the
+    # top row first like Tiled stores them, and the metadata needed to turn the ids back into sprites
+    with open(map_path) as map_file:
+        tiled_map = json.load(map_file)
+    map_directory = os.path.dirname(map_path)
+    layers = [layer for layer in tiled_map["layers"] if layer["type"] == "tilelayer"]
+    tiles = np.zeros((len(layers), tiled_map["height"], tiled_map["width"]), dtype=np.uint32)
+    for i, layer in enumerate(layers):
+        tiles[i] = np.asarray(layer["data"], dtype=np.uint32).reshape(tiled_map["height"], tiled_map["width"])
+    tiles &= TILE_ID_MASK
+
+    # Every tile id that is used, with the image it's cut from and where. Only tilesets that are a single image are
+    # supported, which is what the level is drawn with
+    tile_images = {}
+    for tileset in tiled_map["tilesets"]:
+        if "image" not in tileset:
+            raise ValueError(f"The tileset {tileset.get('name', tileset.get('source'))} in {map_path} isn't embedded "
+                             f"as a single image")
+        image_path = os.path.join(map_directory, tileset["image"]).replace(os.sep, "/")
+        margin, spacing = tileset.get("margin", 0), tileset.get("spacing", 0)
+        for tile_id in range(tileset["tilecount"]):
+            column, row = tile_id % tileset["columns"], tile_id // tileset["columns"]
+            tile_images[tileset["firstgid"] + tile_id] = [
+                image_path,
+                margin + column * (tileset["tilewidth"] + spacing),
+                margin + row * (tileset["tileheight"] + spacing),
+                tileset["tilewidth"],
+                tileset["tileheight"],
+            ]
+    metadata = {
+        "width": tiled_map["width"],
+        "height": tiled_map["height"],
+        "tile_width": tiled_map["tilewidth"],
+        "tile_height": tiled_map["tileheight"],
+        "layers": [layer["name"] for layer in layers],
+        "tile_images": {str(tile_id): tile_images[tile_id] for tile_id in np.unique(tiles) if tile_id},
+    }
+    return tiles, metadata
+
+
+def compile_level(map_path=s.LEVEL_MAP, output_path=s.LEVEL_COMPILED):
+
+    # The compiled level is the tile id array as it is in memory plus the metadata as a JSON string, uncompressed so
+    # loading it is a straight read whatever the size of the map
+    tiles, metadata = load_tiled_map(map_path)
+    np.savez(output_path, tiles=tiles, metadata=np.array(json.dumps(metadata)))
+    return tiles, metadata
+
+
+def is_compiled(map_path=s.LEVEL_MAP, compiled_path=s.LEVEL_COMPILED):
+    return os.path.exists(compiled_path) and os.path.getmtime(compiled_path) >= os.path.getmtime(map_path)
+
+
+class LevelMap:
+    def __init__(self, map_path=s.LEVEL_MAP, compiled_path=s.LEVEL_COMPILED):
+
+        # Load the compiled level when it's there and newer than the map, otherwise read the Tiled JSON once
+        start_time = time.perf_counter()
+        if is_compiled(map_path, compiled_path):
+            with np.load(compiled_path) as compiled:
+                self.tiles = compiled["tiles"]
+                metadata = json.loads(str(compiled["metadata"]))
+            self.source = compiled_path
+        else:
+            self.tiles, metadata = load_tiled_map(map_path)
+            self.source = map_path
+        self.width = metadata["width"]
+        self.height = metadata["height"]
+        self.tile_width = metadata["tile_width"]
+        self.tile_height = metadata["tile_height"]
+        self.layers = metadata["layers"]
+        self.tile_images = {int(tile_id): image for tile_id, image in metadata["tile_images"].items()}
+        self.timings = {"load level": (time.perf_counter() - start_time) * 1000}
+
+    def get_texture(self, tile_id):
+        image_path, x, y, width, height = self.tile_images[tile_id]
+        texture = texture_bank.get_texture(image_path)
+        if (x, y, width, height) != (0, 0, texture.width, texture.height):
+            texture = texture.crop(x, y, width, height)
+        return texture
+
+    def make_sprite_list(self, layer, scaling, use_spatial_hash=True, spatial_hash_cell_size=128):
+
+        # One sprite per tile of the layer, placed the same way arcade places Tiled tiles: the first row is the top
+        tiles = self.tiles[self.layers.index(layer)]
+        sprite_list = arcade.SpriteList(use_spatial_hash=use_spatial_hash,
+                                        spatial_hash_cell_size=spatial_hash_cell_size)
+        textures = {}
+        for row, column in zip(*np.nonzero(tiles)):
+            tile_id = int(tiles[row, column])
+            texture = textures.get(tile_id)
+            if texture is None:
+                texture = textures[tile_id] = self.get_texture(tile_id)
+            sprite = arcade.Sprite(texture, scaling)
+            sprite.center_x = (column + 0.5) * self.tile_width * scaling
+            sprite.center_y = (self.height - row - 0.5) * self.tile_height * scaling
+            sprite_list.append(sprite)
+        return sprite_list
+
+
+def get_box(sprite):
+    return sprite.left, sprite.right, sprite.bottom, sprite.top
+
+
+class BoxIndex:
+    def __init__(self, cell_size=s.WALL_INDEX_CELL_SIZE):
+
+        # Boxes as left, right, bottom, top sorted into square cells, so checking a box only looks at the boxes in the
+        # cells it covers instead of at all of them
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def get_cells(self, box):
+        left, right, bottom, top = box
+        for cell_x in range(math.floor(left / self.cell_size), math.floor(right / self.cell_size) + 1):
+            for cell_y in range(math.floor(bottom / self.cell_size), math.floor(top / self.cell_size) + 1):
+                yield cell_x, cell_y
+
+    def insert(self, box):
+        for cell in self.get_cells(box):
+            self.cells.setdefault(cell, []).append(box)
+
+    def overlaps(self, box):
+        left, right, bottom, top = box
+        for cell in self.get_cells(box):
+            for other_left, other_right, other_bottom, other_top in self.cells.get(cell, ()):
+                if left < other_right and other_left < right and bottom < other_top and other_bottom < top:
+                    return True
+        return False
+
+
+def place_walls(count, size, bounds, blocked, seed, attempts=s.WALL_PLACE_ATTEMPTS):
+
+    # Pick the centers of count walls of the given width and height inside the left, right, bottom, top bounds, with
+    # none of them overlapping each other or the blocked boxes. Random spots are tried first, once the tries run out
+    # every free spot on a grid the size of a wall is tried in a shuffled order, so the count is always met while there
+    # is room left on that grid. The seed is the only source of randomness, the same seed always gives the same centers
+    rng = random.Random(seed)
+    half_width, half_height = size[0] / 2, size[1] / 2
+    index = BoxIndex(max(s.WALL_INDEX_CELL_SIZE, size[0], size[1]))
+    for box in blocked:
+        index.insert(box)
+    left, right, bottom, top = (int(bound) for bound in bounds)
+    positions = []
+
+    def try_place(x, y):
+        box = (x - half_width, x + half_width, y - half_height, y + half_height)
+        if index.overlaps(box):
+            return
+        index.insert(box)
+        positions.append((x, y))
+
+    for i in range(count * attempts):
+        if len(positions) == count:
+            return positions
+        try_place(rng.randint(left, right), rng.randint(bottom, top))
+
+    step_x, step_y = math.ceil(size[0]), math.ceil(size[1])
+    spots = [(x, y) for x in range(left, right + 1, step_x) for y in range(bottom, top + 1, step_y)]
+    rng.shuffle(spots)
+    for x, y in spots:
+        if len(positions) == count:
+            break
+        try_place(x, y)
+    if len(positions) < count:
+        raise ValueError(f"Only {len(positions)} of {count} walls fit in {bounds}")
+    return positions
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description="Compile the Tiled level map into the binary level the game loads")
+    parser.add_argument("--map", default=s.LEVEL_MAP, help="Tiled JSON map to compile")
+    parser.add_argument("--output", default=s.LEVEL_COMPILED, help="file the compiled level is written to")
+    return parser.parse_args(args)
+
+
+if __name__ == "__main__":
+    options = parse_args()
+    start_time = time.perf_counter()
+    level_tiles, level_metadata = compile_level(options.map, options.output)
+    print(f"Compiled the {level_metadata['width']}x{level_metadata['height']} map {options.map} with "
+          f"{len(level_metadata['layers'])} layers into {options.output} in "
+          f"{(time.perf_counter() - start_time) * 1000:.1f} ms")
@@ -0,0 +1,169 @@
+import time
+
+from arcade.experimental import Shadertoy
+
+import settings as s
+
+# The lighting modes, the raymarch is the original per-pixel shader and is kept as the reference for the shadow map
+SHADOW_MAP = "shadow_map"
+RAYMARCH = "raymarch"
+LIGHTING_MODES = (SHADOW_MAP, RAYMARCH)
+
+# Stretches the lighting over the window when it was drawn at a lower render scale
+UPSCALE_SOURCE = """
+void mainImage( out vec4 fragColor, in vec2 fragCoord )
+{
+    fragColor = texture(iChannel0, fragCoord / iResolution.xy);
+}
+"""
+
+
+def scale_size(size, scale):
+    return max(1, int(size[0] * scale)), max(1, int(size[1] * scale))
+
+
+def load_level_source(level, mode):
+
+    # The level shaders do both modes, the shadow map one is switched on with a define
+    with open(f"shaders/level_{level}_shader.glsl") as file:
+        source = file.read()
+    if mode == SHADOW_MAP:
+        source = "#define SHADOW_MAP\n" + source
+    return source
+
+
+class ShaderCache:
+    def __init__(self):
+
+        # Every program is compiled once and kept for the whole game, the timings go in the startup report
+        self.shadertoys = {}
+        self.timings = {}
+
+    def load(self, name, source, size):
+        shadertoy = self.shadertoys.get(name)
+        if shadertoy is None:
+            start_time = time.perf_counter()
+            shadertoy = self.shadertoys[name] = Shadertoy(size, source)
+            self.timings[f"compile {name}"] = (time.perf_counter() - start_time) * 1000
+        return shadertoy
+
+    def load_level(self, level, mode, size):
+        return self.load(f"level_{level}_{mode}", load_level_source(level, mode), size)
+
+    def precompile_levels(self, levels, size):
+        for level in levels:
+            for mode in LIGHTING_MODES:
+                self.load_level(level, mode, size)
+
+
+class RenderTargets:
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.size = None
+        self.allocations = 0
+        self.timings = {}
+
+        # The channels the level shader reads, and the target the lighting is drawn to below full render scale
+        self.channel0 = None
+        self.channel1 = None
+        self.lighting = None
+
+    def make_framebuffer(self, size):
+        return self.ctx.framebuffer(color_attachments=[self.ctx.texture(size, components=4)])
+
+    def resize(self, size):
+
+        # Only reallocate when the size really changed, the framebuffers stay the same objects so the shaders that
+        # sample them don't need their channels set again. Returns True when the targets were reallocated
+        if size == self.size:
+            return False
+        start_time = time.perf_counter()
+        if self.channel0 is None:
+            self.channel0 = self.make_framebuffer(size)
+            self.channel1 = self.make_framebuffer(size)
+            self.lighting = self.make_framebuffer(size)
+        else:
+            for framebuffer in (self.channel0, self.channel1, self.lighting):
+                framebuffer.color_attachments[0].resize(size)
+                framebuffer.resize()
+        self.size = size
+        self.allocations += 1
+        self.timings["allocate render targets"] = (time.perf_counter() - start_time) * 1000
+        return True
+
+
+class ShadowMap:
+    def __init__(self, ctx, shader_cache, size=s.SHADOW_MAP_SIZE):
+        self.ctx = ctx
+
+        # One float pixel per angle around the light, nearest filtering so the wall distances of neighbouring rays
+        # don't get blended together
+        self.texture = ctx.texture((size, 1), components=4, dtype="f4", filter=(ctx.NEAREST, ctx.NEAREST))
+        self.framebuffer = ctx.framebuffer(color_attachments=[self.texture])
+        with open("shaders/shadow_map.glsl") as file:
+            self.shadertoy = shader_cache.load("shadow_map", file.read(), (size, 1))
+
+    def render(self, occluders, light_position, light_size):
+        self.shadertoy.channel_0 = occluders
+        self.shadertoy.program["lightPosition"] = light_position
+        self.shadertoy.program["lightSize"] = light_size
+
+        # Blending would mix the distances with whatever was in the map before
+        with self.ctx.enabled_only(), self.framebuffer.activate():
+            self.shadertoy.render()
+
+
+class RenderScaler:
+    def __init__(self, ctx=None, scale=s.RENDER_SCALE, auto=s.RENDER_SCALE_AUTO,
+                 target_ms=s.RENDER_SCALE_TARGET_MS):
+        self.auto = auto
+        self.target_ms = target_ms
+
+        # Only the GPU time of the passes drawn at the render scale is measured, with a timer query around them, so a
+        # frame that is slow on the CPU or waiting on vsync doesn't lower the scale. Timer queries need desktop GL
+        self.query = None
+        if auto and ctx is not None and ctx.gl_api == "gl":
+            self.query = ctx.query(samples=False, time=True, primitives=False)
+
+        # The GPU times of the window being averaged
+        self.frame_times = []
+        self.changes = 0
+
+        self.scale = 1.0
+        self.set_scale(scale)
+
+    def set_scale(self, scale):
+        scale = round(min(max(scale, s.RENDER_SCALE_MIN), 1.0), 2)
+        if scale == self.scale:
+            return False
+        self.scale = scale
+        self.changes += 1
+        return True
+
+    def begin(self):
+
+        # Start timing the scaled passes, end is called once they've all been drawn
+        if self.query is not None:
+            self.query.__enter__()
+
+    def end(self):
+        if self.query is not None:
+            self.query.__exit__(None, None, None)
+            self.frame_times.append(self.query.time_elapsed / 1e6)
+
+    def frame(self):
+
+        # Average the GPU times over a window of frames, returns True when the scale changed
+        if self.query is None or len(self.frame_times) < s.RENDER_SCALE_WINDOW:
+            return False
+        average = sum(self.frame_times) / len(self.frame_times)
+        self.frame_times.clear()
+
+        # Drop the scale while the passes take too long. Their time goes with the number of pixels, so only raise it
+        # again when the next scale up would still be under the target
+        if average > self.target_ms * (1 + s.RENDER_SCALE_MARGIN):
+            return self.set_scale(self.scale - s.RENDER_SCALE_STEP)
+        next_scale = min(self.scale + s.RENDER_SCALE_STEP, 1.0)
+        if average * (next_scale / self.scale) ** 2 < self.target_ms * (1 - s.RENDER_SCALE_MARGIN):
+            return self.set_scale(next_scale)
+        return False
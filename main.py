@@ -1,31 +1,53 @@
 import math
 import random
 import time
-from pathlib import Path
 
 import arcade
-from arcade.experimental import Shadertoy
 from arcade.experimental.crt_filter import CRTFilter
 from pyglet.math import Vec2
 
+import animation
+import audio
+import barriers
+import broadphase
 import darkfairy
 import darkfairy_spell
 import flameslash
+import flowfield
+import hud
+import level
+import lighting
+import pathfinding
 import player
+import pools
+import profiler
+import spawning
+import swarm
 import swordslash
+import timestep
 import boxsprite
+import collisions
+import culling
 import ghost as g
 import settings as s
+from texturebank import texture_bank
 
 
 class MyGame(arcade.Window):
-    def __init__(self, width, height, title):
+    def __init__(self, width, height, title, clock=time.time, pathfinding_workers=s.PATHFINDING_WORKERS):
         super().__init__(width, height, title, resizable=True)
+        start_time = time.perf_counter()
+
+        # Decode the animation frames up front in parallel, instead of one at a time as the sprites first ask for them.
+        # The player animations that are never played are left to load if they are ever asked for
+        texture_timings = texture_bank.preload(exclude=player.LAZY_ANIMATIONS)
+
+        # The clock every game timer reads, the headless runner passes in a simulated one
+        self.clock = clock
 
         # Init player stats
         self.player = None
-        self.heart_frames = []
-        self.heart_frame = 0
+        self.heart_animator = animation.Animator("heart", "beat")
 
         # Init the sprite lists
         self.wall_list = arcade.SpriteList()
@@ -50,8 +72,7 @@ class MyGame(arcade.Window):
         self.no_ghost_timer = 0.0
         self.transition_time = 0.0
         self.score = 0
-        self.music_timer = time.time()
-        self.general_timer = time.time()
+        self.general_timer = self.clock()
         self.health = s.PLAYER_STARTING_HEALTH
         self.is_transitioning = False
         self.is_dead = False
@@ -60,70 +81,90 @@ class MyGame(arcade.Window):
         self.title_screen = True
         self.restart = False
         self.debug_mode = True
-        self.swoosh_sounds = []
+        self.show_profiler = False
         self.is_door_open = False
-        self.door_open_sound = arcade.load_sound("sounds/door_open.wav")
-        for i in range(3):
-            self.swoosh_sounds.append(arcade.load_sound(f"sounds/sword_swoosh-{i}.wav"))
-        arcade.play_sound(arcade.load_sound("sounds/most.wav"), s.MUSIC_VOLUME)
-        self.music_timer = time.time() + (5 * 60) + 57
+
+        # Load the sounds in the background, the music starts looping once it's ready
+        self.audio = audio.AudioManager()
 
         # Make the colors
         self.level_1_floor_color = (108, 121, 147)
         self.level_2_floor_color = (51, 25, 0)
 
-        # Init the shaders
+        # Init the shaders, both levels are compiled up front in every lighting mode so changing level later is only a
+        # program swap, the shadow map is only used in the shadow map lighting mode
         self.box_shadertoy = None
+        self.lighting_mode = s.LIGHTING_MODE
+        self.shader_cache = lighting.ShaderCache()
+        self.shader_cache.precompile_levels((1, 2), self.get_size())
+        self.shadow_map = lighting.ShadowMap(self.ctx, self.shader_cache)
+
+        # Init the render targets and scale, below 1 the lighting gets its own target and is stretched over the window
+        self.render_targets = lighting.RenderTargets(self.ctx)
+        self.render_scaler = lighting.RenderScaler(self.ctx)
         self.channel0 = None
         self.channel1 = None
+        self.lighting_target = None
+        self.upscale_shadertoy = self.shader_cache.load("upscale", lighting.UPSCALE_SOURCE, self.get_size())
+        self.make_render_targets()
         self.load_shader(self.level)
 
         # Init the pathfinding vars
-        self.path = None
-        self.barrier_list = None
+        self.barrier_grid = None
+        self.flow_field = None
+        self.pathfinding_pool = None
 
-        # Load the level map
-        map_location = "assets/level/level_map.json"
-        layer_options = {"Tile Layer 1": {"use_spatial_hash": True, "spatial_hash_cell_size": 128}}
-        self.level_map = arcade.tilemap.load_tilemap(map_location, s.SPRITE_SCALING, layer_options=layer_options)
+        # Load the level map, the compiled level when there is one, and make the walls from its tiles
+        self.level_map = level.LevelMap()
         self.map_center_x = self.level_map.width * self.level_map.tile_width * s.SPRITE_SCALING / 2
         self.map_center_y = self.level_map.height * self.level_map.tile_height * s.SPRITE_SCALING / 2
-        self.wall_tile_map = arcade.load_tilemap(map_location, s.SPRITE_SCALING, layer_options)
-        self.wall_tile_map = arcade.Scene.from_tilemap(self.wall_tile_map)
-        scene_wall_sprite_list = self.wall_tile_map.get_sprite_list("Tile Layer 1")
-        self.wall_list.extend(scene_wall_sprite_list)
-        self.generate_walls(self.level_map.width, self.level_map.height)
-        self.generate_secret_door()
+        self.tile_wall_list = self.level_map.make_sprite_list(s.LEVEL_WALL_LAYER, s.SPRITE_SCALING)
+        self.wall_list.extend(self.tile_wall_list)
 
         # Make sprites in the field
         self.player = player.Player(self.map_center_x, self.map_center_y, s.PLAYER_SCALING)
         self.player_list.append(self.player)
         self.box_sprite=boxsprite.BoxSprite(self.map_center_x, self.map_center_y)
         self.box_sprite_list.append(self.box_sprite)
-        self.spawn_ghosts_on_empty_list()
+
+        # Place the walls around the player and the secret door, the seed is drawn from the game's random numbers so a
+        # seeded game gets the same layout
+        self.wall_seed = random.randrange(2 ** 32) if s.WALL_SEED is None else s.WALL_SEED
+        self.generate_secret_door()
+        self.generate_walls()
+
+        # Make the sprite pools, these are reused for the whole session so that spawning doesn't allocate
+        self.ghost_pool = pools.SpritePool(g.GhostMonster, s.GHOST_POOL_SIZE, s.GHOST_POOL_MAX_SIZE,
+                                           self.map_center_x, self.map_center_y, s.MONSTER_SCALING)
+        self.swordslash_pool = pools.SpritePool(swordslash.SwordSlash, s.SLASH_POOL_SIZE, s.SLASH_POOL_MAX_SIZE,
+                                                self.player)
+        self.flameslash_pool = pools.SpritePool(flameslash.FlameSlash, s.SLASH_POOL_SIZE, s.SLASH_POOL_MAX_SIZE,
+                                                self.player)
+        self.spell_pool = pools.SpritePool(darkfairy_spell.DarkFairySpell, s.SPELL_POOL_SIZE, s.SPELL_POOL_MAX_SIZE,
+                                           self.map_center_x, self.map_center_y, s.BOSS_SCALING)
 
         # Handle hearts
-        self.load_heart_frames()
         for i in range(int(self.health / 10)):
-            heart = arcade.Sprite("assets/heart/heart-0.png", s.HEART_SCALING)
+            heart = arcade.Sprite(texture_bank.get_texture("assets/heart/heart-0.png"), s.HEART_SCALING)
             heart.center_x = (self.width - 200) + i * 40
             heart.center_y = 45
             self.heart_list.append(heart)
         self.heart_list.reverse()
 
-        # Make the physics engine
-        self.player_and_wall_collider = arcade.PhysicsEngineSimple(self.player, self.wall_list)
-        self.player_and_secret_door_collider = arcade.PhysicsEngineSimple(self.player, self.secret_door_list)
-        self.player_and_ghost_collider = None
-        self.player_and_boss_collider = None
-        self.boss_and_wall_collider = None
-        self.ghost_and_wall_collider = None
-        self.ghost_and_ghost_collider = None
-        self.ghost_and_boss_collider = None
+        # Make the collision engine, it resolves the player, ghost and boss contacts in one pass per tick
+        self.collision_engine = collisions.CollisionEngine(self.player, self.wall_list, self.secret_door_list,
+                                                           self.ghost_list, self.boss_list)
+
+        # Make the broadphase the projectiles find what they hit with, the walls and the door don't move so they're
+        # hashed once
+        self.broadphase = broadphase.Broadphase()
+        self.broadphase.add_static("walls", self.wall_list)
+        self.broadphase.add_static("doors", self.secret_door_list)
         self.camera = arcade.Camera2D()
         self.camera_gui = arcade.Camera2D()
+        self.culler = culling.Culler()
 
-        # Make the pathfinding grid
+        # Make the pathfinding grid, the walls and the secret door block it and it hears when the door opens
         self.playing_field_left_boundary = 0
         self.playing_field_right_boundary = (
             self.level_map.width * self.level_map.tile_width * s.SPRITE_SCALING)
@@ -131,9 +172,9 @@ class MyGame(arcade.Window):
             self.level_map.height * self.level_map.tile_height * s.SPRITE_SCALING)
         self.playing_field_bottom_boundary = 0
         self.grid_size = 128 * s.SPRITE_SCALING
-        self.barrier_list = arcade.AStarBarrierList(
+        self.barrier_grid = barriers.BarrierGrid(
             self.player,
-            self.wall_list,
+            [*self.wall_list, *self.secret_door_list],
             self.grid_size,
             self.playing_field_left_boundary,
             self.playing_field_right_boundary,
@@ -141,50 +182,150 @@ class MyGame(arcade.Window):
             self.playing_field_top_boundary,
         )
 
+        # Index the free cells of the grid, the ghosts, bosses and spells are placed on them
+        self.spawn_index = spawning.SpawnIndex(self.barrier_grid)
+        self.spawn_ghosts_on_empty_list()
+
+        # Make the flow field that every hunting ghost shares to find its way to the player, solved in worker processes
+        # when there are any
+        if pathfinding_workers:
+            self.pathfinding_pool = pathfinding.PathfindingPool(pathfinding_workers)
+        self.flow_field = flowfield.FlowField(self.barrier_grid, self.pathfinding_pool)
+
+        # Make the ghost swarm, it moves all the ghosts at once with NumPy when swarm mode is on
+        self.ghost_swarm = swarm.GhostSwarm()
+
+        # Make the fixed time step the game runs in, and the smoothing of the moving sprites between its ticks
+        self.timestep = timestep.FixedTimestep()
+        self.interpolator = timestep.Interpolator(lambda: (self.player_list, self.ghost_list, self.boss_list,
+                                                           self.dark_fairy_spell_list, self.swordslash_list,
+                                                           self.flameslash_list))
+        self.frame_time = 1 / 60
+
+        # Make the HUD, its text is kept between frames and drawn in one batch
+        self.hud = hud.Hud()
+
+        # Make the frame profiler, press P in debug mode to show its panel
+        self.profiler = profiler.FrameProfiler(self.ctx)
+
         # Make the CRT filter
         self.crt_filter = CRTFilter(width, height, resolution_down_scale=1.0,
                                     hard_scan=-3.0,
                                     hard_pix=-3.0,
                                     display_warp=Vec2(1 / 32, 1 / 64))
 
+        # Keep how long the textures took to load, the shaders to compile, the render targets to allocate and the
+        # level to load for the startup report
+        self.startup_report = {**texture_timings, **self.shader_cache.timings, **self.render_targets.timings,
+                               **self.level_map.timings, "build barrier grid": self.barrier_grid.build_time * 1000,
+                               "startup": (time.perf_counter() - start_time) * 1000}
+
     def on_draw(self):
+        self.profiler.begin()
+        if self.render_scaler.frame():
+            self.make_render_targets()
+
+        # Draw the moving sprites part way to their next tick with the camera on the drawn player, they're put back
+        # once the frame is drawn
+        if s.INTERPOLATE_SPRITES:
+            self.interpolator.apply(self.timestep.get_alpha())
+            self.scroll_to_player()
         self.camera.use()
+        self.culler.update(self.camera)
 
-        # Select channel 1 (below-shadow layer) to draw on, then draw it
+        # Select channel 1 (below-shadow layer) to draw on, then draw it. The render scaler times the GPU from here to
+        # the end of the lighting pass
+        self.render_scaler.begin()
         self.channel1.use()
         self.channel1.clear()
         self.draw_channel1()
+        self.profiler.mark("draw_channel1", gpu=True)
 
         # Select channel 0 (shadow layer) to draw on, then draw it
         self.channel0.use()
         self.channel0.clear()
         self.draw_channel0()
+        self.profiler.mark("draw_channel0", gpu=True)
+
+        # Reduce channel 0 to the shadow map around the light
+        if self.lighting_mode == lighting.SHADOW_MAP:
+            self.shadow_map.render(self.channel0.color_attachments[0], self.get_light_position(),
+                                   self.get_light_size())
+            self.profiler.mark("shadow_map.render", gpu=True)
 
         # Select our window (top game layer) to draw on, then draw it
         self.use()
         self.clear()
         self.crt_filter.draw()
+        self.profiler.mark("crt_filter.draw", gpu=True)
         self.draw_window()
 
         # Select the GUI camera (top layer) to draw on, then draw the GUI
         self.camera_gui.use()
         self.draw_gui()
+        self.profiler.mark("draw_gui", gpu=True)
+        self.profiler.end("on_draw")
+
+        # Draw the profiler panel last so it isn't timed itself
+        if self.show_profiler:
+            self.profiler.draw(self.width - 20, self.height - 20)
+        self.interpolator.restore()
+
+    def close(self):
+        if self.pathfinding_pool is not None:
+            self.pathfinding_pool.close()
+        super().close()
+
+    def on_resize(self, width, height):
+        super().on_resize(width, height)
 
+        # The render targets follow the window size, the shaders themselves are kept
+        if self.box_shadertoy is not None:
+            self.make_render_targets()
 
     def on_update(self, delta_time: float = 1 / 60):
-        self.update_physics()
+
+        # Run the game in fixed ticks however long the frame was, the time left over carries on to the next frame
+        self.frame_time = delta_time
+        for i in range(self.timestep.advance(delta_time)):
+            if s.INTERPOLATE_SPRITES:
+                self.interpolator.snapshot()
+            self.update_tick(self.timestep.tick_time)
+
+    def update_tick(self, delta_time):
+        self.profiler.begin()
+        self.update_physics(delta_time)
+        self.profiler.mark("update_physics")
         self.update_movement()
-        self.update_projectiles()
+        self.profiler.mark("update_movement")
+        self.update_projectiles(delta_time)
+        self.profiler.mark("update_projectiles")
         self.update_secret_door()
+        self.profiler.mark("update_secret_door")
         self.update_music()
+        self.profiler.mark("update_music")
 
         self.update_player(delta_time)
+        self.profiler.mark("update_player")
         self.update_gui(delta_time)
+        self.profiler.mark("update_gui")
         self.update_ghosts(delta_time)
+        self.profiler.mark("update_ghosts")
         self.update_bosses(delta_time)
+        self.profiler.mark("update_bosses")
         self.update_altar(delta_time)
+        self.profiler.mark("update_altar")
+        self.profiler.end("on_update")
 
     def on_key_press(self, key: arcade.key, modifiers):
+        if self.debug_mode and key == arcade.key.P:
+            self.show_profiler = not self.show_profiler
+
+        # Switch between the shadow map lighting and the reference raymarch to compare them
+        if self.debug_mode and key == arcade.key.L:
+            modes = lighting.LIGHTING_MODES
+            self.lighting_mode = modes[(modes.index(self.lighting_mode) + 1) % len(modes)]
+            self.load_shader(self.level)
         if self.heart_list:
             self.key_press_buffer.add(key)
         if self.restart:
@@ -213,7 +354,7 @@ class MyGame(arcade.Window):
 
         # If the floor is transitioning, use the shader to determine the color of the floor
         else:
-            self.transition_time += 1
+            self.transition_time += self.frame_time * s.TUNED_TICK_RATE
 
             # Calculate progress (0.0 to 1.0) of transition
             progress = min(self.transition_time / 300, 1.0)
@@ -235,57 +376,64 @@ class MyGame(arcade.Window):
                 self.transition_time = 0
 
     def draw_channel0(self):
-        self.wall_list.draw()
+        self.culler.draw_still("walls", self.wall_list)
         self.secret_door_list.draw()
 
     def draw_channel1(self):
         self.box_sprite_list.draw()
-        self.altar_list.draw()
-        self.ghost_list.draw()
-        self.boss_list.draw()
-        self.dark_fairy_spell_list.draw()
+        self.culler.draw_still("altars", self.altar_list)
+        self.culler.draw_moving("ghosts", self.ghost_list)
+        self.culler.draw_moving("bosses", self.boss_list)
+        self.culler.draw_moving("spells", self.dark_fairy_spell_list)
 
     def draw_window(self):
-        screen_center = (self.width / 2, self.height / 2)
-        self.box_shadertoy.program['lightPosition'] = screen_center
-        self.box_shadertoy.program['lightSize'] = s.SPOTLIGHT_SIZE
-        self.box_shadertoy.render()
+        self.box_shadertoy.program['lightPosition'] = self.get_light_position()
+        self.box_shadertoy.program['lightSize'] = self.get_light_size()
+        if self.lighting_target is None:
+            self.box_shadertoy.render()
+        else:
+
+            # Draw the lighting without blending so the stretched copy blends with the window like it would have
+            with self.ctx.enabled_only(), self.lighting_target.activate():
+                self.box_shadertoy.render()
+            self.upscale_shadertoy.render()
+        self.render_scaler.end()
+        self.profiler.mark("box_shadertoy.render", gpu=True)
 
         # Draw the projectiles first
         self.swordslash_list.draw()
         self.flameslash_list.draw()
 
         self.player_list.draw()
+        self.profiler.mark("draw_window", gpu=True)
+
+    def get_light_position(self):
+
+        # The light is in the middle of the screen, in the pixels of the channels
+        return self.channel0.width / 2, self.channel0.height / 2
+
+    def get_light_size(self):
+        return s.SPOTLIGHT_SIZE * self.channel0.width / self.width
 
     def draw_gui(self):
         self.heart_list.draw()
         if s.ghosts_killed == 0:
             self.score = 0
-        score_text = f"Score: {int(self.score / 6.5)}.0"
-
-        ghost_text = f"Ghosts: {len(self.ghost_list)}.0"
-        arcade.draw_text(ghost_text, x=40, y=70, color=(255, 255, 242), font_size=19, font_name="Garamond")
-        arcade.draw_text(score_text, x=40, y=32, color=(255, 255, 242), font_size=19, font_name="Garamond")
-
-        # Draw the title screen if the game hasn't started yet
-        if self.title_screen:
-            arcade.draw_text("Welcome to: The Cistern", x=s.SCREEN_WIDTH / 2, y=s.SCREEN_HEIGHT / 2 + 50,
-                             color=(255, 255, 242), font_size=72, font_name="Garamond", anchor_x="center",
-                             anchor_y="baseline", bold=True)
-            arcade.draw_text("Press any key to start.", x=s.SCREEN_WIDTH / 2, y=s.SCREEN_HEIGHT / 2 - 100,
-                             color=(255, 255, 242), font_size=36, font_name="Garamond", anchor_x="center",
-                             anchor_y="baseline")
-
-        # Draw the game over screen if the player has died
+        self.hud.set("ghosts", f"Ghosts: {len(self.ghost_list)}.0")
+        self.hud.set("score", f"Score: {int(self.score / 6.5)}.0")
+
+        # Show the title screen if the game hasn't started yet
+        self.hud.set("title", "Welcome to: The Cistern" if self.title_screen else "")
+        self.hud.set("start", "Press any key to start." if self.title_screen else "")
+
+        # Show the game over screen if the player has died
+        self.hud.set("game_over", "" if self.heart_list else "GAME OVER")
         if not self.heart_list:
-            arcade.draw_text("GAME OVER", x=s.SCREEN_WIDTH / 2, y=s.SCREEN_HEIGHT / 2 + 50,
-                             color=(255, 255, 242), font_size=72, font_name="Garamond", anchor_x="center",
-                             anchor_y="baseline", bold=True)
 
             # Draw the game over effects:
             # If the player isn't already transparent make the player sprite slowly fade out
             if self.player.alpha != 0:
-                self.player.alpha -= 0.03 * self.player.alpha
+                self.player.alpha -= 0.03 * self.player.alpha * min(self.frame_time * s.TUNED_TICK_RATE, 1)
                 self.player.alpha = max(0, self.player.alpha)
             elif not self.is_faded_out:
                 self.is_faded_out = True
@@ -294,89 +442,85 @@ class MyGame(arcade.Window):
 
             # If the player is fully transparent, spawn a ghost on their death location
             elif not self.has_spawned_player_death_ghost:
-                ghost_sprite = g.GhostMonster(self.player.center_x, self.player.center_y,
-                                              s.PLAYER_SCALING)
-                ghost_sprite.texture = arcade.load_texture("assets/enemies/ghost/g_south-0.png")
+                ghost_sprite = self.ghost_pool.acquire(self.player.center_x, self.player.center_y,
+                                                       s.PLAYER_SCALING)
                 ghost_sprite.is_death_ghost = True
                 self.player.remove_from_sprite_lists()
                 self.ghost_list.append(ghost_sprite)
                 self.has_spawned_player_death_ghost = True
 
-        # Draw the restart text if the player's ghost has spawned
-        if self.restart:
-            arcade.draw_text("Press x to restart.", x=s.SCREEN_WIDTH / 2, y=s.SCREEN_HEIGHT / 2 - 100,
-                             color=(255, 255, 242), font_size=36, font_name="Garamond", anchor_x="center",
-                             anchor_y="baseline")
-
-        # Draw the debug text if the debug mode is enabled and the debug key is pressed
-        if self.debug_mode and arcade.key.D in self.key_press_buffer:
-            num_ghosts_hunting = 0
-            ghost_velocities = []
+        # Show the restart text if the player's ghost has spawned
+        self.hud.set("restart", "Press x to restart." if self.restart else "")
+
+        # Show the debug text if the debug mode is enabled and the debug key is pressed
+        self.update_debug_text(self.debug_mode and arcade.key.D in self.key_press_buffer)
+
+        # Draw all the text in one go
+        self.hud.draw()
+
+    def update_debug_text(self, is_shown):
+        if not is_shown:
+            for name in ("culling", "render_scale", "ghost_pool", "pathfinding", "broadphase", "player_position",
+                         "ghosts_hunting"):
+                self.hud.set(name, "")
+            for i in range(s.HUD_DEBUG_GHOSTS):
+                self.hud.set(f"ghost_{i}_velocity", "")
+                self.hud.set(f"ghost_{i}_position", "")
+            return
+
+        # In swarm mode the ghosts' motion is kept in the swarm's arrays rather than on the sprites
+        num_ghosts_hunting = 0
+        if s.GHOST_SWARM_MODE:
+            num_ghosts_hunting = self.ghost_swarm.get_hunting_count()
+        else:
             for ghost in self.ghost_list:
                 if ghost.is_hunting:
                     num_ghosts_hunting += 1
-                ghost_velocities.append((ghost.change_x, ghost.change_y))
-            text = f"Player position: ({int(self.player.position[0])}, {int(self.player.position[1])}), " \
-                   f" ({int(self.player.top)}, {int(self.player.left)}, " \
-                   f"{int(self.player.bottom)}, {int(self.player.right)})."
-            ghost_hunting_text = f"Ghosts hunting you: {num_ghosts_hunting}."
-            arcade.draw_text(ghost_hunting_text, x=40, y=964, color=(255, 255, 242), font_size=19,
-                             font_name="Garamond")
-            for i in range((len(ghost_velocities))):
-                ghost_velocity_text = f"\n    Ghost {i} velocity: ({ghost_velocities[i][0]}, " \
-                                      f" {ghost_velocities[i][1]})."
-                ghost_position_text = f"Ghost {i} position: ({int(self.ghost_list[i].position[0])}, " \
-                                      f" {int(self.ghost_list[i].position[1])})."
-                arcade.draw_text(ghost_velocity_text, x=40, y=904 - (i * 30 * 2), color=(255, 255, 242),
-                                 font_size=19, font_name="Garamond")
-                arcade.draw_text(ghost_position_text, x=90, y=874 - (i * 30 * 2), color=(255, 255, 242),
-                                 font_size=19, font_name="Garamond")
-                if i == 4:
-                    break
-            arcade.draw_text(text, x=40, y=934, color=(255, 255, 242), font_size=19,
-                             font_name="Garamond")
-
-    def update_physics(self):
-        if self.heart_list:
-            self.player_and_ghost_collider = arcade.PhysicsEngineSimple(self.player, self.ghost_list)
-            self.player_and_ghost_collider.update()
-            self.player_and_wall_collider.update()
-            if s.bosses_killed < 3:
-                self.player_and_secret_door_collider.update()
-        else:
+        self.hud.set("player_position", f"Player position: ({int(self.player.position[0])}, "
+                                        f"{int(self.player.position[1])}),  ({int(self.player.top)}, "
+                                        f"{int(self.player.left)}, {int(self.player.bottom)}, "
+                                        f"{int(self.player.right)}).")
+        self.hud.set("ghosts_hunting", f"Ghosts hunting you: {num_ghosts_hunting}.")
+        for i in range(s.HUD_DEBUG_GHOSTS):
+            if i < len(self.ghost_list):
+                ghost = self.ghost_list[i]
+                change_x, change_y = ghost.change_x, ghost.change_y
+                if s.GHOST_SWARM_MODE:
+                    change_x, change_y = self.ghost_swarm.get_velocity(ghost)
+                self.hud.set(f"ghost_{i}_velocity", f"\n    Ghost {i} velocity: ({change_x},  {change_y}).")
+                self.hud.set(f"ghost_{i}_position", f"Ghost {i} position: ({int(ghost.position[0])}, "
+                                                    f" {int(ghost.position[1])}).")
+            else:
+                self.hud.set(f"ghost_{i}_velocity", "")
+                self.hud.set(f"ghost_{i}_position", "")
+        ghost_pool_stats = self.ghost_pool.stats()
+        self.hud.set("culling", f"Drawn: {self.culler.get_report()}.")
+        self.hud.set("render_scale", f"Render scale: {self.render_scaler.scale:.2f}, {self.lighting_mode} lighting.")
+        self.hud.set("ghost_pool", f"Ghost pool: {ghost_pool_stats['in_use']} in use, {ghost_pool_stats['free']} "
+                                   f"free, {ghost_pool_stats['created']} created.")
+        broadphase_stats = self.broadphase.stats()
+        self.hud.set("broadphase", f"Projectile pairs: {broadphase_stats['candidate_pairs']} of "
+                                   f"{broadphase_stats['scan_pairs']} tested, {broadphase_stats['hit_pairs']} hits.")
+        if self.pathfinding_pool is not None:
+            pathfinding_stats = self.pathfinding_pool.stats()
+            self.hud.set("pathfinding", f"Pathfinding: {pathfinding_stats['depth']} queued, "
+                                        f"{pathfinding_stats['max_depth']} max, {pathfinding_stats['deduplicated']} "
+                                        f"deduplicated, {pathfinding_stats['cached']} cached, "
+                                        f"{pathfinding_stats['latency_ms']:.1f} ms.")
+
+    def update_physics(self, delta_time):
+        if not self.heart_list:
             for ghost in self.ghost_list:
                 ghost.can_hunt = False
 
-        if self.boss_list:
-            for boss in self.boss_list:
-                self.boss_and_wall_collider = arcade.PhysicsEngineSimple(boss, self.wall_list)
-                self.boss_and_wall_collider.update()
-                self.player_and_boss_collider = arcade.PhysicsEngineSimple(self.player, self.boss_list)
-                self.player_and_boss_collider.update()
-
-        for ghost in self.ghost_list:
-            if arcade.check_for_collision_with_list(ghost, self.wall_list):
-                self.ghost_and_wall_collider = arcade.PhysicsEngineSimple(ghost, self.wall_list)
-                self.ghost_and_wall_collider.update()
-            if arcade.check_for_collision_with_list(ghost, self.ghost_list):
-                self.ghost_and_ghost_collider = arcade.PhysicsEngineSimple(ghost, self.ghost_list)
-                self.ghost_and_ghost_collider.update()
-            if self.boss_list:
-                self.ghost_and_boss_collider = arcade.PhysicsEngineSimple(ghost, self.boss_list)
-                self.ghost_and_boss_collider.update()
+        self.collision_engine.update(bool(self.heart_list), s.bosses_killed < 3, delta_time)
 
     def update_movement(self):
         self.scroll_to_player()
         self.process_key_presses()
-        for projectile in self.swordslash_list:
-            if arcade.check_for_collision_with_list(projectile, self.wall_list):
-                projectile.is_hitting_wall = True
-            elif arcade.check_for_collision_with_list(projectile, self.secret_door_list):
-                projectile.is_hitting_wall = True
-        for projectile in self.flameslash_list:
-            if arcade.check_for_collision_with_list(projectile, self.wall_list):
-                projectile.is_hitting_wall = True
-            elif arcade.check_for_collision_with_list(projectile, self.secret_door_list):
+        slashes = (*self.swordslash_list, *self.flameslash_list)
+        if slashes:
+            for projectile, layer, wall in self.broadphase.find_hits(slashes, s.PROJECTILE_BLOCKERS):
                 projectile.is_hitting_wall = True
 
         # Decrease the player's speed when a boss is out because for whatever reason the player's speed is increased
@@ -398,56 +542,45 @@ class MyGame(arcade.Window):
                             self.player.change_x *= 0.9
                             self.player.change_y *= 0.9
 
-    def update_projectiles(self):
+    def update_projectiles(self, delta_time):
 
         # Update the swordslash projectiles
-        self.swordslash_list.update()
-        self.swordslash_list.update_animation()
+        self.swordslash_list.update(delta_time)
+        self.swordslash_list.update_animation(delta_time)
 
         # Update the flameslash projectiles
-        self.flameslash_list.update()
-        self.flameslash_list.update_animation()
+        self.flameslash_list.update(delta_time)
+        self.flameslash_list.update_animation(delta_time)
 
         # Make a new projectile if the attack key is pressed and the player is not already attacking
         if self.player.is_slashing and self.player.c_key_timer == 0 and not self.swordslash_list and \
                 s.bosses_killed < 1:
-            slash_projectile = swordslash.SwordSlash(self.player)
+            slash_projectile = self.swordslash_pool.acquire(self.player)
             self.swordslash_list.append(slash_projectile)
-            arcade.play_sound(random.choice(self.swoosh_sounds), s.SWOOSH_VOLUME)
+            self.audio.play("swoosh", s.SWOOSH_VOLUME)
         elif self.player.is_slashing and self.player.c_key_timer == 0 and not self.flameslash_list and \
                 s.bosses_killed >= 1:
-            flameslash_projectile = flameslash.FlameSlash(self.player)
+            flameslash_projectile = self.flameslash_pool.acquire(self.player)
             self.flameslash_list.append(flameslash_projectile)
-            arcade.play_sound(random.choice(self.swoosh_sounds), s.SWOOSH_VOLUME)
-
-        # Handle swordslash dealing damage
-        if self.swordslash_list:
-            for projectile in self.swordslash_list:
-                projectile_collisions = arcade.check_for_collision_with_list(projectile, self.ghost_list)
-                for ghost in projectile_collisions:
-                    self.handle_ghost_damage(ghost, projectile)
-                boss_collisions = arcade.check_for_collision_with_list(projectile, self.boss_list)
-                for boss in boss_collisions:
-                    self.handle_boss_damage(boss, projectile)
-
-        # Handle flameslash dealing damage
-        if self.flameslash_list:
-            for projectile in self.flameslash_list:
-                projectile_collisions = arcade.check_for_collision_with_list(projectile, self.ghost_list)
-                for ghost in projectile_collisions:
-                    self.handle_ghost_damage(ghost, projectile)
-                boss_collisions = arcade.check_for_collision_with_list(projectile, self.boss_list)
-                for boss in boss_collisions:
-                    self.handle_boss_damage(boss, projectile)
-
-        # Update the dark fairy's spells and make them deal damage
-        self.dark_fairy_spell_list.update()
-        self.dark_fairy_spell_list.update_animation()
+            self.audio.play("swoosh", s.SWOOSH_VOLUME)
+
+        # Update the dark fairy's spells
+        self.dark_fairy_spell_list.update(delta_time)
+        self.dark_fairy_spell_list.update_animation(delta_time)
         for spell in self.dark_fairy_spell_list:
             self.move_spell(spell)
-            spell_collisions = arcade.check_for_collision_with_list(spell, self.ghost_list)
-            for ghost in spell_collisions:
-                self.handle_ghost_damage(ghost, spell)
+
+        # Hash the ghosts and bosses once for the tick, then find what every slash and spell hits in one query and deal
+        # the damage. Nothing needs hashing while there are no projectiles out
+        projectiles = (*self.swordslash_list, *self.flameslash_list, *self.dark_fairy_spell_list)
+        if projectiles:
+            self.broadphase.update({"ghosts": self.ghost_list, "bosses": self.boss_list}, len(projectiles))
+            for projectile, layer, sprite in self.broadphase.find_hits(projectiles, s.PROJECTILE_TARGETS):
+                if layer == "ghosts":
+                    self.handle_ghost_damage(sprite, projectile)
+                else:
+                    self.handle_boss_damage(sprite, projectile)
+        for spell in self.dark_fairy_spell_list:
             if arcade.check_for_collision(spell, self.player):
                 self.handle_player_damage()
 
@@ -458,12 +591,9 @@ class MyGame(arcade.Window):
             self.player.change_y *= s.SLASH_CHARGE_SPEED_MODIFIER
 
     def update_gui(self, delta_time):
-        self.heart_frame += 18 * delta_time
+        heart_texture = self.heart_animator.update(delta_time)
         for heart in self.heart_list:
-            if self.heart_frame < len(self.heart_frames):
-                heart.texture = self.heart_frames[int(self.heart_frame)]
-            else:
-                self.heart_frame = 0
+            heart.texture = heart_texture
 
         # Set the first heart's size to represent the player's health
         for heart in self.heart_list:
@@ -484,9 +614,14 @@ class MyGame(arcade.Window):
                 self.score += 11
 
     def update_ghosts(self, delta_time):
+        if s.GHOST_SWARM_MODE:
+            self.update_ghost_swarm(delta_time)
+            return
+
         self.ghost_list.update(delta_time)  # Pass delta_time to ghost_list update
         self.ghost_list.update_animation(delta_time)
         self.spawn_ghosts_on_empty_list()
+        self.flow_field.update(self.player.position)
         for ghost in self.ghost_list:
             if not ghost.is_being_hurt and self.title_screen is False:
                 self.move_ghost(ghost)
@@ -497,9 +632,21 @@ class MyGame(arcade.Window):
             if arcade.check_for_collision(ghost, self.player):
                 self.handle_player_damage()
 
+    def update_ghost_swarm(self, delta_time):
+        self.flow_field.update(self.player.position)
+        touching_ghosts = self.ghost_swarm.update(self.ghost_list, self.flow_field, self.player, not self.is_dead,
+                                                  self.title_screen is False, delta_time,
+                                                  self.collision_engine.contacts)
+
+        # Make the ghosts deal damage to the player
+        for ghost in touching_ghosts:
+            self.handle_player_damage()
+        self.ghost_list.update_animation(delta_time)
+        self.spawn_ghosts_on_empty_list()
+
     def update_bosses(self, delta_time):
         self.boss_list.update(delta_time)  # Pass delta_time to boss_list update
-        self.boss_list.update_animation()
+        self.boss_list.update_animation(delta_time)
         if self.boss_list:
             self.move_boss()
 
@@ -511,18 +658,14 @@ class MyGame(arcade.Window):
                                                                                 self.player,
                                                                                 boss) < 400 and boss.phase == 2):
                     boss.is_casting = True
-                    spell_x = self.player.center_x + random.randint(-300, 300)
-                    spell_y = self.player.center_y + random.randint(-300, 300)
-                    spell = darkfairy_spell.DarkFairySpell(spell_x, spell_y, s.BOSS_SCALING, boss)
-                    distance = arcade.get_distance_between_sprites(spell, self.player)
-                    if distance > spell.min_spawn_distance:
-                        self.dark_fairy_spell_list.append(spell)
+                    spell = self.spell_pool.acquire(self.player.center_x, self.player.center_y, s.BOSS_SCALING,
+                                                     boss.phase)
+                    spell_position = self.spawn_index.sample_one(self.player.position, spell.min_spawn_distance,
+                                                                 s.SPELL_SPAWN_DISTANCE)
+                    if spell_position is None:
+                        self.spell_pool.release(spell)
                     else:
-                        while distance <= spell.min_spawn_distance:
-                            spell_x = self.player.center_x + random.randint(-500, 500)
-                            spell_y = self.player.center_y + random.randint(-500, 500)
-                            spell.center_x, spell.center_y = spell_x, spell_y
-                            distance = arcade.get_distance_between_sprites(spell, self.player)
+                        spell.position = spell_position
                         self.dark_fairy_spell_list.append(spell)
 
         # Spawn the boss once you kill enough ghosts
@@ -538,11 +681,14 @@ class MyGame(arcade.Window):
                     s.bosses_to_spawn = 2
 
     def update_secret_door(self):
-        if s.bosses_killed >= 3:
+        if s.bosses_killed >= 3 and not self.is_door_open:
+
+            # Open the door's cells of the pathing grid before it goes
+            self.barrier_grid.remove(self.secret_door_list)
+            self.broadphase.remove_static("doors", self.secret_door_list)
             self.secret_door_list.clear()
-            if not self.is_door_open:
-                self.is_door_open = True
-                arcade.play_sound(self.door_open_sound, 0.5)
+            self.is_door_open = True
+            self.audio.play("door", s.DOOR_VOLUME)
 
     def update_altar(self, delta_time):
         self.altar_list.update_animation(delta_time)
@@ -563,70 +709,68 @@ class MyGame(arcade.Window):
                     self.is_transitioning = True
 
     def update_music(self):
-        if time.time() > self.music_timer:
-            arcade.play_sound(arcade.load_sound("sounds/most.wav"), s.MUSIC_VOLUME)
-            self.music_timer = time.time() + (5 * 60) + 57
+        self.audio.update()
 
     def load_shader(self, level: int):
-        shader_file_path = Path(f"shaders/level_{level}_shader.glsl")
-        window_size = self.get_size()
-        self.box_shadertoy = Shadertoy.create_from_file(window_size, shader_file_path)
+
+        # The programs are all compiled at startup, so this only swaps in the level's one and points it at the channels
+        self.box_shadertoy = self.shader_cache.load_level(level, self.lighting_mode, self.get_size())
         if self.level == 2:
             self.box_shadertoy.program['iMix'] = 0
+        self.assign_channels()
 
-        # Create the channels 0 and 1 frame buffers.
-        # Make the buffer the size of the window, with 4 channels (RGBA)
-        self.channel0 = self.box_shadertoy.ctx.framebuffer(
-            color_attachments=[self.box_shadertoy.ctx.texture(window_size, components=4)])
-        self.channel1 = self.box_shadertoy.ctx.framebuffer(
-            color_attachments=[self.box_shadertoy.ctx.texture(window_size, components=4)])
+    def make_render_targets(self):
+        window_size = self.get_size()
+        render_size = lighting.scale_size(window_size, self.render_scaler.scale)
+
+        # The channels 0 and 1 frame buffers are the size of the window times the render scale, with 4 channels
+        # (RGBA), and are only reallocated when that size changes
+        self.render_targets.resize(render_size)
+        self.channel0 = self.render_targets.channel0
+        self.channel1 = self.render_targets.channel1
+
+        # Below full scale the lighting is drawn at the channels' size too, then stretched over the window
+        if render_size != window_size:
+            self.lighting_target = self.render_targets.lighting
+            self.upscale_shadertoy.channel_0 = self.lighting_target.color_attachments[0]
+            self.upscale_shadertoy.size = window_size
+        else:
+            self.lighting_target = None
+        if self.box_shadertoy is not None:
+            self.assign_channels()
+
+    def assign_channels(self):
+        self.box_shadertoy.size = self.render_targets.size
 
         # Assign the frame buffers to the channels
         self.box_shadertoy.channel_0 = self.channel0.color_attachments[0]
         self.box_shadertoy.channel_1 = self.channel1.color_attachments[0]
-
-    def load_heart_frames(self):
-        for i in range(0, 7):
-            self.heart_frames.append(arcade.load_texture(f"assets/heart/heart-{i}.png"))
-
-    def generate_walls(self, map_width, map_height):
-        map_width = int(map_width * self.level_map.tile_width * s.SPRITE_SCALING)
-        map_height = int(map_height * self.level_map.tile_height * s.SPRITE_SCALING)
-        for i in range(70):
-            x = random.randint(100, map_width - 100)
-            y = random.randint(100, map_height - 100)
-            wall = arcade.Sprite("assets/level/wall.png", s.SPRITE_SCALING)
+        self.box_shadertoy.channel_2 = self.shadow_map.texture
+
+    def print_startup_report(self):
+        for name, milliseconds in self.startup_report.items():
+            print(f"{name:<32}{milliseconds:>10.2f} ms")
+
+    def generate_walls(self, count=s.WALL_COUNT, seed=None):
+
+        # Walls go anywhere inside the margin that they don't overlap another wall, the player, a boss or the secret
+        # door. The same seed always gives the same layout
+        texture = texture_bank.get_texture("assets/level/wall.png")
+        map_width = int(self.level_map.width * self.level_map.tile_width * s.SPRITE_SCALING)
+        map_height = int(self.level_map.height * self.level_map.tile_height * s.SPRITE_SCALING)
+        bounds = (s.WALL_MARGIN, map_width - s.WALL_MARGIN, s.WALL_MARGIN, map_height - s.WALL_MARGIN)
+        blocked = [level.get_box(sprite) for sprite_list in (self.wall_list, self.player_list, self.boss_list,
+                                                             self.secret_door_list) for sprite in sprite_list]
+        positions = level.place_walls(count, (texture.width * s.SPRITE_SCALING, texture.height * s.SPRITE_SCALING),
+                                      bounds, blocked, self.wall_seed if seed is None else seed)
+        for x, y in positions:
+            wall = arcade.Sprite(texture, s.SPRITE_SCALING)
             wall.center_x = x
             wall.center_y = y
-            overlap = False
-            for wall_check in self.wall_list:
-                if wall.collides_with_sprite(wall_check):
-                    overlap = True
-                    break
-                elif wall.collides_with_list(self.player_list):
-                    overlap = True
-                    break
-                elif wall.collides_with_list(self.boss_list):
-                    overlap = True
-                    break
-            if not overlap:
-                if random.random() > 0.9:
-                    # Ensure wall.scale is numeric before modifying it
-                    if isinstance(wall.scale, (int, float)):
-                        wall.scale *= random.randint(50, 200) / 100
-                    if random.random() > 0.95 and isinstance(wall.scale, (int, float)):
-                        wall.scale *= random.randint(150, 400) / 100
-                if random.random() > 0.9 and isinstance(wall.scale, (int, float)):
-                    wall.scale *= random.randint(50, 200) / 100
-                self.wall_list.append(wall)
-            else:
-                x = random.randint(100, map_width - 100)
-                y = random.randint(100, map_height - 100)
-                wall.center_x = x
-                wall.center_y = y
+            self.wall_list.append(wall)
 
     def generate_secret_door(self):
-        secret_door = arcade.Sprite("assets/level/wall.png", 0.55)
+        secret_door = arcade.Sprite(texture_bank.get_texture("assets/level/wall.png"), 0.55)
         secret_door.center_x = 2493
         secret_door.center_y = 66
         self.secret_door_list.append(secret_door)
@@ -665,22 +809,14 @@ class MyGame(arcade.Window):
             if not ghost.is_hunting:
                 ghost.is_hunting = True
 
-            self.path = arcade.astar_calculate_path(ghost.position,
-                                                    self.player.position,
-                                                    self.barrier_list,
-                                                    diagonal_movement=False)
-
-            # Figure out where we want to go
-            try:
-                if ghost.current_path_position < len(self.path) - 1:
-                    next_x = self.path[ghost.current_path_position + 1][0]
-                    next_y = self.path[ghost.current_path_position + 1][1]
-                else:
+            # Figure out where we want to go, the flow field only changes when the player moves to a new cell. With the
+            # pathfinding pool the ghost keeps following the last field until the new one comes back from it
+            next_point = self.flow_field.next_step(ghost.position)
+            if next_point is not None:
+                next_x, next_y = next_point
+            else:
 
-                    # We are at the end of the path
-                    next_x = self.player.center_x
-                    next_y = self.player.center_y
-            except TypeError:
+                # We are at the end of the path
                 next_x = self.player.center_x
                 next_y = self.player.center_y
 
@@ -698,17 +834,6 @@ class MyGame(arcade.Window):
                 ghost.change_x += s.MONSTER_MOVEMENT_SPEED * ghost.change_x / abs(ghost.change_x)
                 ghost.change_y += s.MONSTER_MOVEMENT_SPEED * ghost.change_y / abs(ghost.change_y)
 
-            # Recalculate distance after the move
-            distance = math.sqrt((ghost.center_x - next_x) ** 2 + (ghost.center_y - next_y) ** 2)
-
-            # If we're close enough, move to the next point
-            if distance < s.MONSTER_MOVEMENT_SPEED:
-                ghost.current_path_position += 1
-
-                # If we're at the end of the path, start over
-                if ghost.current_path_position >= len(self.path):
-                    ghost.current_path_position = 0
-
         # If we can't find a path, or are far enough away from the player just move randomly:
         else:
             ghost.is_hunting = False
@@ -722,7 +847,8 @@ class MyGame(arcade.Window):
                                self.player.center_x - spell.center_x)
             spell.change_x = math.cos(angle) * s.SPELL_MOVEMENT_SPEED
             spell.change_y = math.sin(angle) * s.SPELL_MOVEMENT_SPEED
-        elif spell.current_frame == int(len(spell.phase_1_frames) / 2):
+        elif not spell.has_turned and spell.animator.index >= spell.animator.animation.frame_count // 2:
+            spell.has_turned = True
             angle = math.atan2(self.player.center_y - spell.center_y,
                                self.player.center_x - spell.center_x)
             spell.change_x = math.cos(angle) * s.SPELL_MOVEMENT_SPEED
@@ -737,33 +863,18 @@ class MyGame(arcade.Window):
                                                int(s.BOSS_MOVEMENT_SPEED * boss.movement_speed_modifier))
 
     def spawn_ghosts(self, level: int):
-        for i in range(int(self.ghosts_to_spawn)):
-            random_x = random.uniform(self.player.center_x - 50, self.player.center_x + 50)
-            random_y = random.uniform(self.player.center_y - 50, self.player.center_y + 50)
-            if random_x < 0 or random_x > self.level_map.width or random_y < 0 or \
-                    random_y > self.level_map.height:
-                random_x = random.uniform(0, self.width)
-                random_y = random.uniform(0, self.height)
-            ghost = g.GhostMonster(random_x, random_y, s.MONSTER_SCALING)
-            ghost.texture = arcade.load_texture("assets/enemies/ghost/g_south-0.png")
-            ghost.health *= 1 + level * 0.5
 
-            # Check if the new ghost collides with any existing ghosts, wall sprites or player
-            collision = False
-            for wall in self.wall_list:
-                if ghost.collides_with_sprite(wall):
-                    collision = True
-                    break
-            if ghost.collides_with_sprite(self.player):
-                collision = True
-            if not collision:
-                if isinstance(ghost.scale, (int, float)) and random.random() > 0.95:
-                    ghost.scale *= random.uniform(0.8, 1.4)
-                self.ghost_list.append(ghost)
-            else:
-
-                # If there is a collision, Don't spawn the ghost and try again
-                self.ghosts_to_spawn += 1
+        # Place the whole burst with one lookup of the free cells in a ring around the player, the ghosts that didn't
+        # fit are left to spawn next time
+        positions = self.spawn_index.sample(self.player.position, *s.GHOST_SPAWN_DISTANCE,
+                                            count=int(self.ghosts_to_spawn), clearance=s.GHOST_SPAWN_CLEARANCE)
+        self.ghosts_to_spawn += int(self.ghosts_to_spawn) - len(positions)
+        for spawn_x, spawn_y in positions:
+            ghost = self.ghost_pool.acquire(spawn_x, spawn_y, s.MONSTER_SCALING)
+            ghost.health *= 1 + level * 0.5
+            if isinstance(ghost.scale, (int, float)) and random.random() > 0.95:
+                ghost.scale *= random.uniform(0.8, 1.4)
+            self.ghost_list.append(ghost)
 
             # If there are too many ghosts, don't spawn more, instead increase the movement
             over_ghosts = len(self.ghost_list) - 25
@@ -786,8 +897,8 @@ class MyGame(arcade.Window):
         # Handle spawning in more ghosts if there aren't any on the screen, and it's been a few seconds
         if not self.ghost_list:
             if self.no_ghost_timer != 0:
-                self.no_ghost_timer = time.time()
-            elif time.time() - self.no_ghost_timer > 5:
+                self.no_ghost_timer = self.clock()
+            elif self.clock() - self.no_ghost_timer > 5:
                 self.spawn_ghosts(self.level)
 
                 # Reset the timer and increase the number of ghosts to spawn
@@ -795,54 +906,29 @@ class MyGame(arcade.Window):
             self.ghosts_to_spawn *= self.ghosts_to_spawn_multiplier
             self.no_ghost_timer = 0.0
 
+    def place_boss(self):
+
+        # Make a boss on a free cell far enough from the player and inside the play area, None when there is no room
+        boss = darkfairy.DarkFairy(self.player.center_x, self.player.center_y, s.BOSS_SCALING)
+        margin = s.BOSS_SPAWN_MARGIN + max(boss.width, boss.height) / 2
+        boss_position = self.spawn_index.sample_one(self.player.position, boss.min_spawn_distance,
+                                                    s.BOSS_SPAWN_DISTANCE, margin)
+        if boss_position is None:
+            return None
+        boss.position = boss_position
+        return boss
+
     def spawn_boss(self):
         for i in range(s.bosses_to_spawn):
+            if len(self.boss_list) > 5:
+                break
 
-            # Always spawn the first boss
-            if s.bosses_killed == 0:
-                if len(self.boss_list) > 5:
-                    break
-                boss_x = self.player.center_x + random.randint(-500, 500)
-                boss_y = self.player.center_y + random.randint(-500, 500)
-                boss = darkfairy.DarkFairy(boss_x, boss_y, s.BOSS_SCALING)
-
-                # Make the boss move into the play area if they are outside it
-                distance = arcade.get_distance_between_sprites(boss, self.player)
-                if distance > boss.min_spawn_distance and boss.left > 32 and boss.top < 2527 and \
-                        boss.right < 2527 and boss.bottom > 32:
-                    self.boss_list.append(boss)
-                else:
-                    while distance <= boss.min_spawn_distance or boss.left < 32 or boss.top > 2527 or \
-                            boss.right > 2527 or boss.bottom < 32:
-                        boss_x = self.player.center_x + random.randint(-500, 500)
-                        boss_y = self.player.center_y + random.randint(-500, 500)
-                        boss.center_x, boss.center_y = boss_x, boss_y
-                        distance = arcade.get_distance_between_sprites(boss, self.player)
+            # Always spawn the first boss, otherwise let there be a chance to spawn a boss
+            if s.bosses_killed == 0 or random.randint(0, 5) == 0:
+                boss = self.place_boss()
+                if boss is not None:
                     self.boss_list.append(boss)
 
-            # Otherwise, let there be a chance to spawn a boss
-            else:
-                if len(self.boss_list) > 5:
-                    break
-                if random.randint(0, 5) == 0:
-                    boss_x = self.player.center_x + random.randint(-500, 500)
-                    boss_y = self.player.center_y + random.randint(-500, 500)
-                    boss = darkfairy.DarkFairy(boss_x, boss_y, s.BOSS_SCALING)
-
-                    distance = arcade.get_distance_between_sprites(boss, self.player)
-                    # Make the ghost move into the play area if they are outside it
-                    if distance > boss.min_spawn_distance and boss.left > 32 and boss.top < 2527 and \
-                            boss.right < 2527 and boss.bottom > 32:
-                        self.boss_list.append(boss)
-                    else:
-                        while distance <= boss.min_spawn_distance or boss.left < 32 or boss.top > 2527 or \
-                                boss.right > 2527 or boss.bottom < 32:
-                            boss_x = self.player.center_x + random.randint(-500, 500)
-                            boss_y = self.player.center_y + random.randint(-500, 500)
-                            boss.center_x, boss.center_y = boss_x, boss_y
-                            distance = arcade.get_distance_between_sprites(boss, self.player)
-                        self.boss_list.append(boss)
-
         if random.randint(0, 3) == 0:
             s.bosses_to_spawn += 1
 
@@ -858,9 +944,9 @@ class MyGame(arcade.Window):
         self.ghosts_to_spawn = 4.0
         self.spawn_ghosts(self.level)
         self.heart_list.clear()
-        self.swordslash_list.clear()
-        self.flameslash_list.clear()
-        self.dark_fairy_spell_list.clear()
+        self.swordslash_pool.release_all(self.swordslash_list)
+        self.flameslash_pool.release_all(self.flameslash_list)
+        self.spell_pool.release_all(self.dark_fairy_spell_list)
         self.boss_list.clear()
         self.player = player.Player(self.map_center_x, self.map_center_y, s.PLAYER_SCALING)
         self.score = 0
@@ -871,10 +957,10 @@ class MyGame(arcade.Window):
         s.bosses_to_spawn = 1
         self.no_ghost_timer = 0.0
         self.player_list.append(self.player)
-        self.player_and_wall_collider = arcade.PhysicsEngineSimple(self.player, self.wall_list)
+        self.collision_engine.player = self.player
         self.health = s.PLAYER_STARTING_HEALTH
         for i in range(int(self.health / 10)):
-            heart = arcade.Sprite("assets/heart/heart-0.png", s.HEART_SCALING)
+            heart = arcade.Sprite(texture_bank.get_texture("assets/heart/heart-0.png"), s.HEART_SCALING)
             heart.center_x = (self.width - 200) + i * 40
             heart.center_y = 45
             self.heart_list.append(heart)
@@ -884,11 +970,14 @@ class MyGame(arcade.Window):
 
         # Reset the ghost list minus the death ghost
         death_ghosts = arcade.SpriteList()
-        for ghost in self.ghost_list:
+        for ghost in list(self.ghost_list):
             if getattr(ghost, 'is_player_death_ghost', False):
                 death_ghosts.append(ghost)
+            else:
+                self.ghost_pool.release(ghost)
 
         self.ghost_list = death_ghosts
+        self.collision_engine.ghost_list = self.ghost_list
 
         self.restart = False
 
@@ -908,8 +997,8 @@ class MyGame(arcade.Window):
         # This discourages spamming the slash key
         if arcade.key.C in self.key_press_buffer:
             if self.player.c_key_timer == 0:
-                self.player.c_key_timer = time.time()
-            elif time.time() - self.player.c_key_timer >= s.SLASH_CHARGE_TIME:
+                self.player.c_key_timer = self.clock()
+            elif self.clock() - self.player.c_key_timer >= s.SLASH_CHARGE_TIME:
                 self.player.is_slashing = True
                 self.player.c_key_timer = 0
 
@@ -1046,4 +1135,5 @@ class MyGame(arcade.Window):
 if __name__ == "__main__":
     window = MyGame(s.SCREEN_WIDTH, s.SCREEN_HEIGHT, s.SCREEN_TITLE)
     window.set_location(0, 30)
+    window.print_startup_report()
     arcade.run()
\ No newline at end of file
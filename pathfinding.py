@@ -0,0 +1,217 @@
+import collections
+import functools
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import settings as s
+
+# The barrier grid a worker process last read, as the name of its shared memory block, the block and the read-only
+# blocked mask over it. The game puts every new grid in a new block, so a worker only attaches when the name changes
+worker_grid = None
+
+
+def get_shared_grid(name, shape):
+    global worker_grid
+    if worker_grid is None or worker_grid[0] != name:
+        if worker_grid is not None:
+
+            # The mask has to go before the block it's a view of can be closed
+            old_memory = worker_grid[1]
+            worker_grid = None
+            old_memory.close()
+        memory = shared_memory.SharedMemory(name)
+        blocked = np.ndarray(shape, dtype=bool, buffer=memory.buf)
+        blocked.flags.writeable = False
+        worker_grid = (name, memory, blocked)
+    return worker_grid[2]
+
+
+def solve_shared(goal, name, shape, left, bottom, grid_size):
+    return solve(goal, (get_shared_grid(name, shape), left, bottom, grid_size))
+
+
+def solve(goal, grid):
+
+    # Breadth first search out from the goal without diagonals, the same moves the ghosts used with A*. Returns the
+    # goal, the distance of every cell to it with -1 where it can't be reached, and the position of the next cell to
+    # step to from every cell with NaN where there is none
+    blocked, left, bottom, grid_size = grid
+    width, height = blocked.shape
+    is_blocked = blocked.tolist()
+    distances = np.full((width, height), -1, dtype=np.int32)
+    next_x = np.full((width, height), np.nan)
+    next_y = np.full((width, height), np.nan)
+    seen = {goal: 0}
+    queue = collections.deque([goal])
+    while queue:
+        cell = queue.popleft()
+        x, y = cell
+        distance = seen[cell] + 1
+        for neighbour in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if neighbour in seen:
+                continue
+            column, row = neighbour[0] - left, neighbour[1] - bottom
+            if not (0 <= column < width and 0 <= row < height) or is_blocked[column][row]:
+                continue
+            seen[neighbour] = distance
+            distances[column, row] = distance
+            next_x[column, row] = int(x * grid_size)
+            next_y[column, row] = int(y * grid_size)
+            queue.append(neighbour)
+    if 0 <= goal[0] - left < width and 0 <= goal[1] - bottom < height:
+        distances[goal[0] - left, goal[1] - bottom] = 0
+    return goal, distances, next_x, next_y
+
+
+def set_finish_time(request, future):
+    request[3] = time.perf_counter()
+
+
+class PathfindingPool:
+    def __init__(self, workers=s.PATHFINDING_WORKERS, budget=s.PATHFINDING_RESULT_BUDGET,
+                 max_pending=s.PATHFINDING_MAX_PENDING, cache_size=s.PATHFINDING_CACHE_SIZE):
+
+        # Solves the flow fields in worker processes so the search doesn't hold up the frame or the GIL. The workers
+        # start once and read the barrier grid from shared memory, only the goal and the grid's name go with a request
+        self.budget = budget
+        self.max_pending = max_pending
+        self.cache_size = cache_size
+        self.executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        self.memory = None
+        self.grid = None
+
+        # The requests being worked on by goal, the recent results by goal, and the finished ones waiting to be
+        # collected. Every request gets a sequence number so the newest result can be told apart, and the time it was
+        # submitted and finished at
+        self.pending = collections.OrderedDict()
+        self.cache = collections.OrderedDict()
+        self.ready = collections.deque()
+        self.sequence = 0
+
+        # Stats
+        self.requests = 0
+        self.submitted = 0
+        self.deduplicated = 0
+        self.cached = 0
+        self.cancelled = 0
+        self.superseded = 0
+        self.completed = 0
+        self.failed = 0
+        self.max_depth = 0
+        self.last_latency = 0.0
+
+        # Set once a worker dies or a solve fails, the pool is shut down and the flow field solves on its own
+        self.is_broken = False
+
+    def set_grid(self, grid):
+
+        # Copy the grid into a new shared memory block and free the old one, a worker still reading it keeps it until
+        # its next request. Everything asked for on the old grid is dropped
+        if self.is_broken:
+            return
+        blocked, left, bottom, grid_size = grid
+        self.free_memory()
+        self.memory = shared_memory.SharedMemory(create=True, size=max(blocked.nbytes, 1))
+        np.ndarray(blocked.shape, dtype=bool, buffer=self.memory.buf)[:] = blocked
+        self.grid = (self.memory.name, blocked.shape, left, bottom, grid_size)
+        for sequence, future, start_time, finish_time in self.pending.values():
+            if future.cancel():
+                self.cancelled += 1
+        self.pending.clear()
+        self.cache.clear()
+        self.ready.clear()
+
+    def request(self, goal):
+
+        # Ask for the field to a goal and return the request's sequence number. A goal already being worked on isn't
+        # asked for again, and a recent one comes straight from the cache
+        self.sequence += 1
+        self.requests += 1
+        if self.is_broken:
+            return self.sequence
+        if goal in self.cache:
+            self.cache.move_to_end(goal)
+            self.ready.append((self.sequence, self.cache[goal]))
+            self.cached += 1
+        elif goal in self.pending:
+            self.pending[goal][0] = self.sequence
+            self.pending.move_to_end(goal)
+            self.deduplicated += 1
+        else:
+
+            # Only the newest requests matter, the oldest ones are cancelled if they haven't started yet
+            while len(self.pending) >= self.max_pending:
+                old_sequence, future, start_time, finish_time = self.pending.popitem(last=False)[1]
+                if future.cancel():
+                    self.cancelled += 1
+            try:
+                future = self.executor.submit(solve_shared, goal, *self.grid)
+            except Exception as error:
+                self.fail(error)
+                return self.sequence
+            request = [self.sequence, future, time.perf_counter(), None]
+            self.pending[goal] = request
+            future.add_done_callback(functools.partial(set_finish_time, request))
+            self.submitted += 1
+            self.max_depth = max(self.max_depth, len(self.pending))
+        return self.sequence
+
+    def collect(self):
+
+        # Gather the finished results and hand out the newest ones, at most the budget of them, newest first. The older
+        # ones are dropped since a newer field replaces them anyway. A request is finished once its done callback has
+        # timed it, so the latency is how long the solve took to come back rather than to be collected
+        for goal, (sequence, future, start_time, finish_time) in list(self.pending.items()):
+            if finish_time is None:
+                continue
+            del self.pending[goal]
+            try:
+                result = future.result()
+            except Exception as error:
+                self.fail(error)
+                return []
+            self.completed += 1
+            self.last_latency = finish_time - start_time
+            self.cache[goal] = result
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+            self.ready.append((sequence, result))
+        ready = sorted(self.ready, key=lambda item: item[0], reverse=True)
+        self.ready.clear()
+        self.superseded += len(ready[self.budget:])
+        return ready[:self.budget]
+
+    def fail(self, error):
+
+        # A dead worker breaks the whole pool and a failed solve would likely fail again, either way stop using the
+        # workers and leave the flow field to solve the fields itself
+        print(f"Pathfinding workers failed, solving the flow field in the game instead: {error!r}", file=sys.stderr)
+        self.failed += 1
+        self.is_broken = True
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.pending.clear()
+        self.ready.clear()
+        self.free_memory()
+
+    def get_depth(self):
+        return len(self.pending)
+
+    def stats(self):
+        return {"depth": len(self.pending), "max_depth": self.max_depth, "requests": self.requests,
+                "submitted": self.submitted, "deduplicated": self.deduplicated, "cached": self.cached,
+                "cancelled": self.cancelled, "superseded": self.superseded, "completed": self.completed,
+                "failed": self.failed, "latency_ms": self.last_latency * 1000}
+
+    def free_memory(self):
+        if self.memory is not None:
+            self.memory.close()
+            self.memory.unlink()
+            self.memory = None
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.free_memory()
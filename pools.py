@@ -0,0 +1,75 @@
+# Mixin for sprites that go back to their pool when they are killed. The sprite class needs a reset method that
+# takes the same arguments as its constructor.
+class PooledSprite:
+    pool = None
+    in_pool = False
+
+    def kill(self):
+        super().kill()
+        if self.pool is not None:
+            self.pool.release(self)
+
+
+class SpritePool:
+    def __init__(self, sprite_class, size, max_size, *prewarm_args):
+        self.sprite_class = sprite_class
+        self.max_size = max(size, max_size)
+        self.free = []
+
+        # Init the stats
+        self.created = 0
+        self.reused = 0
+        self.released = 0
+        self.discarded = 0
+        self.in_use = 0
+
+        # Fill the pool up front so that spawning doesn't allocate during play
+        for i in range(size):
+            sprite = self.create(*prewarm_args)
+            sprite.in_pool = True
+            self.free.append(sprite)
+
+    def create(self, *args):
+        sprite = self.sprite_class(*args)
+        sprite.pool = self
+        self.created += 1
+        return sprite
+
+    def acquire(self, *args):
+        if self.free:
+            sprite = self.free.pop()
+            sprite.in_pool = False
+            sprite.reset(*args)
+            self.reused += 1
+        else:
+            sprite = self.create(*args)
+        self.in_use += 1
+        return sprite
+
+    def release(self, sprite):
+        if sprite.in_pool:
+            return
+        sprite.remove_from_sprite_lists()
+        sprite.in_pool = True
+        self.in_use -= 1
+        self.released += 1
+
+        # Drop the sprite if the pool is already full, it will be garbage collected
+        if len(self.free) < self.max_size:
+            self.free.append(sprite)
+        else:
+            self.discarded += 1
+
+    def release_all(self, sprite_list):
+        for sprite in list(sprite_list):
+            self.release(sprite)
+
+    def stats(self):
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "released": self.released,
+            "discarded": self.discarded,
+            "in_use": self.in_use,
+            "free": len(self.free),
+        }
@@ -0,0 +1,111 @@
+import time
+
+import arcade
+import numpy as np
+import settings as s
+
+
+class FrameProfiler:
+    def __init__(self, ctx=None, history=s.PROFILER_HISTORY, sync_gpu=s.PROFILER_SYNC_GPU):
+
+        # Drawing only queues work for the GPU, so finish it before each draw mark when the GPU time should count too
+        self.sync = ctx.finish if ctx is not None and sync_gpu else None
+        self.enabled = s.PROFILER_ENABLED
+        self.history = history
+
+        # One ring buffer of frame times in milliseconds per section, in the order the sections were first seen
+        self.samples = {}
+        self.counts = {}
+        self.start_time = 0.0
+        self.last_mark = 0.0
+
+        # The panel's stats and text are only refreshed every few frames so they can be read
+        self.frames_drawn = 0
+        self.panel_stats = {}
+        self.header = None
+        self.rows = {}
+
+    def begin(self):
+        if not self.enabled:
+            return
+        self.start_time = self.last_mark = time.perf_counter()
+
+    def mark(self, name, gpu=False):
+
+        # Record the time since the last mark under the name
+        if not self.enabled:
+            return
+        if gpu and self.sync is not None:
+            self.sync()
+        now = time.perf_counter()
+        self.record(name, (now - self.last_mark) * 1000)
+        self.last_mark = now
+
+    def end(self, name):
+        if not self.enabled:
+            return
+        self.record(name, (time.perf_counter() - self.start_time) * 1000)
+
+    def record(self, name, milliseconds):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = np.zeros(self.history)
+            self.counts[name] = 0
+        samples[self.counts[name] % self.history] = milliseconds
+        self.counts[name] += 1
+
+    def stats(self, name):
+        samples = self.samples[name][:min(self.counts[name], self.history)]
+        return {"min_ms": float(samples.min()), "avg_ms": float(samples.mean()),
+                "p99_ms": float(np.percentile(samples, 99))}
+
+    def make_row(self, name, min_text, avg_text, p99_text):
+        return [arcade.Text(text, 0, 0, s.HUD_TEXT_COLOR, 12, font_name=s.HUD_FONT,
+                            anchor_x="left" if i == 0 else "right")
+                for i, text in enumerate((name, min_text, avg_text, p99_text))]
+
+    def refresh(self):
+        if self.header is None:
+            self.header = self.make_row("ms per frame", "min", "avg", "p99")
+        self.panel_stats = {name: self.stats(name) for name in self.samples}
+        for name, stats in self.panel_stats.items():
+            values = [f"{stats[key]:.2f}" for key in ("min_ms", "avg_ms", "p99_ms")]
+            row = self.rows.get(name)
+            if row is None:
+                self.rows[name] = self.make_row(name, *values)
+                continue
+            for text, value in zip(row[1:], values):
+                if text.text != value:
+                    text.text = value
+
+    @staticmethod
+    def draw_row(row, left, y):
+        for text, x in zip(row, (left, left + 240, left + 310, left + 380)):
+            text.position = x, y
+            text.draw()
+
+    def draw(self, right, top):
+        if not self.samples:
+            return
+        if self.frames_drawn % s.PROFILER_REFRESH == 0 or len(self.panel_stats) != len(self.samples):
+            self.refresh()
+        self.frames_drawn += 1
+
+        # Each row is the section name, its min/avg/p99 in milliseconds, and a bar where the solid part is the average,
+        # the faded part reaches the p99, and the white line marks the whole frame budget
+        left = right - s.PROFILER_PANEL_WIDTH
+        bar_left = left + 390
+        bar_width = right - bar_left - 10
+        bottom = top - (len(self.panel_stats) + 1) * s.PROFILER_ROW_HEIGHT
+        arcade.draw_lrbt_rectangle_filled(left - 10, right, bottom - 10, top + 10, (0, 0, 0, 170))
+        arcade.draw_line(bar_left + bar_width, bottom, bar_left + bar_width, top, (255, 255, 242), 1)
+        self.draw_row(self.header, left, top - s.PROFILER_ROW_HEIGHT + 6)
+        for i, (name, stats) in enumerate(self.panel_stats.items()):
+            y = top - (i + 2) * s.PROFILER_ROW_HEIGHT + 6
+            self.draw_row(self.rows[name], left, y)
+            color = (230, 90, 80) if stats["p99_ms"] > s.PROFILER_BUDGET_MS else (120, 200, 120)
+            average = bar_left + min(stats["avg_ms"] / s.PROFILER_BUDGET_MS, 1) * bar_width
+            p99 = bar_left + min(stats["p99_ms"] / s.PROFILER_BUDGET_MS, 1) * bar_width
+            arcade.draw_lrbt_rectangle_filled(bar_left, max(average, bar_left + 1), y, y + 12, color)
+            if p99 > average:
+                arcade.draw_lrbt_rectangle_filled(average, p99, y, y + 12, color[:3] + (90,))
@@ -26,6 +26,16 @@ BOSS_MOVEMENT_SPEED = 1
 SWORDSLASH_FPS = 1/70
 SLASH_CHARGE_TIME = 0.05
 
+# The game runs in fixed ticks at the simulation rate whatever the frame rate, and the moving sprites are drawn part
+# way between their last two ticks. The speeds and timers are tuned per tick at the tuned rate and scaled to the real
+# one. A frame never runs more than the max ticks, and a sprite that moved further than the max distance in a tick
+# isn't smoothed
+SIMULATION_RATE = 60
+TUNED_TICK_RATE = 60
+MAX_TICKS_PER_FRAME = 5
+INTERPOLATE_SPRITES = True
+INTERPOLATE_MAX_DISTANCE = 64
+
 # Sizes
 SPOTLIGHT_SIZE = 500
 MONSTER_VISION_RANGE = 340
@@ -38,6 +48,20 @@ HEART_SCALING = 0.1
 BOSS_SCALING = 0.35
 ALTAR_SCALING = 1
 
+# Ghost settings, swarm mode moves all the ghosts at once with NumPy instead of one at a time and is off by default
+GHOST_SWARM_MODE = False
+
+# Collision settings
+COLLISION_CELL_SIZE = 128
+
+# Broadphase settings, the projectiles find what they hit through spatial hashes of the sprites by layer. Each type of
+# projectile is tested against its target layers for damage and its blocker layers for hitting a wall. The moving
+# layers are only put in a grid with at least this many projectiles out, fewer are cheaper to test against every sprite
+BROADPHASE_CELL_SIZE = 128
+BROADPHASE_MIN_PROJECTILES = 4
+PROJECTILE_TARGETS = {"swordslash": ("ghosts", "bosses"), "flameslash": ("ghosts", "bosses"), "spell": ("ghosts",)}
+PROJECTILE_BLOCKERS = {"swordslash": ("walls", "doors"), "flameslash": ("walls", "doors")}
+
 # Alpha
 GHOST_ALPHA = 210
 
@@ -50,3 +74,127 @@ GHOST_HEALTH = 4
 # Volume settings
 MUSIC_VOLUME = 0.4
 SWOOSH_VOLUME = 0.5
+DOOR_VOLUME = 0.5
+
+# Audio settings, the sound effects by category are decoded into memory once and the music is streamed from disk, both
+# in loader threads. A category plays at most its limit of voices at once, a new one stops its oldest
+SOUND_EFFECTS = {
+    "swoosh": [f"sounds/sword_swoosh-{i}.wav" for i in range(3)],
+    "door": ["sounds/door_open.wav"],
+}
+MUSIC_TRACK = "sounds/most.wav"
+VOICE_LIMITS = {"swoosh": 2, "door": 1}
+SOUND_LOAD_WORKERS = 2
+
+# Lighting settings
+LIGHTING_MODE = "shadow_map"
+SHADOW_MAP_SIZE = 2048
+
+# Render scale settings, the channels and the lighting are drawn at this fraction of the window size. In auto mode the
+# scale moves between the minimum and 1.0 to hold the GPU time of those passes under the target
+RENDER_SCALE = 1.0
+RENDER_SCALE_MIN = 0.5
+RENDER_SCALE_AUTO = False
+RENDER_SCALE_TARGET_MS = 8.0
+RENDER_SCALE_MARGIN = 0.1
+RENDER_SCALE_STEP = 0.125
+RENDER_SCALE_WINDOW = 30
+
+# Culling settings, still sprites are drawn by square chunks of the map and everything is drawn with a margin around
+# the view
+CULL_ENABLED = True
+CULL_CHUNK_SIZE = 512
+CULL_MARGIN = 128
+
+# Animation settings, the manifest holds the frames of every animation and the default frame rate is in frames per
+# second
+ANIMATION_MANIFEST = "assets/animations.json"
+ANIMATION_FPS = 10
+
+# Texture settings, how many threads decode the images at startup, and where build_atlas.py puts the atlas pages. The
+# game's atlas is sized for the preloaded textures, in steps with room for the packing, and no bigger than the max size
+TEXTURE_LOAD_WORKERS = 8
+ATLAS_DIRECTORY = "assets/atlas"
+ATLAS_MANIFEST = "assets/atlas/manifest.json"
+ATLAS_PAGE_SIZE = 4096
+ATLAS_MAX_SIZE = 12288
+ATLAS_SIZE_STEP = 256
+ATLAS_PACKING_SLACK = 1.15
+
+# The textures the game loads by path instead of through an animation, they're preloaded along with the animations
+SLASH_TEXTURE_DIRECTIONS = ("north", "south", "east", "west", "northeast", "northwest", "southeast", "southwest")
+STATIC_TEXTURES = (
+    "assets/background.png",
+    "assets/level/wall.png",
+    "assets/heart/heart-0.png",
+    "assets/altar/pentagram2-0.png",
+    "assets/player/south-0.png",
+    "assets/enemies/ghost/g_south-0.png",
+    *(f"assets/projectiles/swordslash/ss_{direction}-0.png" for direction in SLASH_TEXTURE_DIRECTIONS),
+    *(f"assets/projectiles/flameslash/flameslash_{direction} (1).png" for direction in SLASH_TEXTURE_DIRECTIONS),
+)
+
+# Level settings, the Tiled map and the compiled level level.py makes from it, the game loads the compiled one when it
+# is newer than the map
+LEVEL_MAP = "assets/level/level_map.json"
+LEVEL_COMPILED = "assets/level/level_map.npz"
+LEVEL_WALL_LAYER = "Tile Layer 1"
+
+# Wall settings, how many walls are scattered over the map and how far from its edges. The seed is drawn from the
+# game's random numbers when it's None. A wall gets this many random tries on average before the free spots are
+# searched in order
+WALL_COUNT = 70
+WALL_MARGIN = 100
+WALL_SEED = None
+WALL_PLACE_ATTEMPTS = 30
+WALL_INDEX_CELL_SIZE = 64
+
+# Spawn settings, the ghosts, bosses and spells are placed on free cells between a minimum and maximum distance from the
+# player. The bosses and spells keep their own minimum, and the bosses stay this far inside the edges of the map. The
+# ghosts are bigger than the player the free cells are worked out for, so they keep a cell of room around them
+GHOST_SPAWN_DISTANCE = (250, 800)
+GHOST_SPAWN_CLEARANCE = 1
+BOSS_SPAWN_DISTANCE = 500
+BOSS_SPAWN_MARGIN = 32
+SPELL_SPAWN_DISTANCE = 300
+
+# Pathfinding settings, the flow field the ghosts follow is solved in this many worker processes, none solves it in the
+# game itself. A frame takes at most the budget of finished fields, and only so many are asked for at once with the
+# oldest dropped first. The fields to the most recent goals are kept to hand out again
+PATHFINDING_WORKERS = 2
+PATHFINDING_RESULT_BUDGET = 1
+PATHFINDING_MAX_PENDING = 4
+PATHFINDING_CACHE_SIZE = 16
+
+# HUD settings
+HUD_FONT = "Garamond"
+HUD_TEXT_COLOR = (255, 255, 242)
+HUD_DEBUG_GHOSTS = 5
+
+# Pool settings
+GHOST_POOL_SIZE = 40
+GHOST_POOL_MAX_SIZE = 60
+SLASH_POOL_SIZE = 2
+SLASH_POOL_MAX_SIZE = 4
+SPELL_POOL_SIZE = 10
+SPELL_POOL_MAX_SIZE = 20
+
+# Headless settings
+HEADLESS_TICKS = 3600
+HEADLESS_DELTA_TIME = 1 / 60
+HEADLESS_SEED = 0
+HEADLESS_PATHFINDING_WORKERS = 0
+
+# Benchmark settings
+BENCHMARK_REPEAT = 15
+BENCHMARK_REGRESSION_THRESHOLD = 0.25
+BENCHMARK_BASELINE = "benchmark_baseline.json"
+
+# Profiler settings
+PROFILER_ENABLED = True
+PROFILER_HISTORY = 240
+PROFILER_REFRESH = 15
+PROFILER_SYNC_GPU = False
+PROFILER_BUDGET_MS = 1000 / 60
+PROFILER_PANEL_WIDTH = 620
+PROFILER_ROW_HEIGHT = 22
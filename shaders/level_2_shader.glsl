@@ -1,5 +1,8 @@
 #define N 500
 
+// How much light gets through each sample of wall
+#define WALL_LIGHT 0.96
+
 // x, y position of the light
 uniform vec2 lightPosition;
 
@@ -16,11 +19,24 @@ float terrain(vec2 samplePoint)
     float returnValue = 1.0 - sampleStepped;
 
     // Soften the edges of the shadows
-    returnValue = mix(0.96, 1.0, returnValue);
+    returnValue = mix(WALL_LIGHT, 1.0, returnValue);
 
     return returnValue;
 }
 
+#ifdef SHADOW_MAP
+#define PI 3.14159265359
+
+// How many pixels of wall are between the fragment and the light, read from the polar shadow map in channel 2
+float wallLength(vec2 fragCoord, float distanceToLight)
+{
+    vec2 lightToFragment = fragCoord - lightPosition;
+    float angle = atan(lightToFragment.y, lightToFragment.x);
+    vec4 walls = texture(iChannel2, vec2((angle + PI) / (2.0 * PI), 0.5));
+    return max(min(distanceToLight, walls.y) - walls.x, 0.0) + max(min(distanceToLight, walls.w) - walls.z, 0.0);
+}
+#endif
+
 void mainImage( out vec4 fragColor, in vec2 fragCoord )
 {
     // Distance in pixels to the light
@@ -32,6 +48,10 @@ void mainImage( out vec4 fragColor, in vec2 fragCoord )
 
     // Start our mixing variable at 1.0
     float lightAmount = 1.0;
+#ifdef SHADOW_MAP
+    // Each of the N samples below lands in a wall with a chance of wall length / distance, so this matches the march
+    lightAmount = pow(WALL_LIGHT, N * wallLength(fragCoord, distanceToLight) / max(distanceToLight, 1.0));
+#else
     for(float i = 0.0; i < N; i++)
     {
         // A 0.0 - 1.0 ratio between where our current pixel is, and where the light is
@@ -44,6 +64,7 @@ void mainImage( out vec4 fragColor, in vec2 fragCoord )
         // (Multiply in case we want to upgrade to soft shadows)
         lightAmount *= shadowAmount;
     }
+#endif
 
     // Find out how much light we have based on the distance to our light
     lightAmount *= 1.0 - smoothstep(0.1, lightSize, distanceToLight);
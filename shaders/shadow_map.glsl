@@ -0,0 +1,47 @@
+// Reduce the occluders in channel 0 to a 1D polar shadow map around the light. Each pixel of the map is one angle, and
+// holds how far from the light the first two walls along that ray start and end
+#define N 500
+#define NO_WALL 1.0e6
+#define PI 3.14159265359
+
+// x, y position of the light
+uniform vec2 lightPosition;
+
+// Size of light in pixels
+uniform float lightSize;
+
+bool isWall(vec2 position)
+{
+    // Normalize the position from (0.0, 0.0) to (1.0, 1.0), off the screen there are no walls
+    vec2 samplePoint = position / iChannelResolution[0].xy;
+    if (any(lessThan(samplePoint, vec2(0.0))) || any(greaterThan(samplePoint, vec2(1.0))))
+    {
+        return false;
+    }
+    return texture(iChannel0, samplePoint).a >= 0.1;
+}
+
+void mainImage( out vec4 fragColor, in vec2 fragCoord )
+{
+    // The angle of the ray this pixel of the map stands for
+    float angle = fragCoord.x / iResolution.x * 2.0 * PI - PI;
+    vec2 direction = vec2(cos(angle), sin(angle));
+
+    // Walk out from the light and write down the distance every time we go into or come out of a wall
+    vec4 walls = vec4(NO_WALL);
+    int edges = 0;
+    bool wasWall = false;
+    for(float i = 0.0; i < N; i++)
+    {
+        float distanceToLight = i / N * lightSize;
+        bool wall = isWall(lightPosition + direction * distanceToLight);
+        if (wall != wasWall && edges < 4)
+        {
+            walls[edges] = distanceToLight;
+            edges++;
+            wasWall = wall;
+        }
+    }
+
+    fragColor = walls;
+}
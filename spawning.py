@@ -0,0 +1,83 @@
+import math
+import random
+
+import numpy as np
+
+
+class SpawnIndex:
+    def __init__(self, barrier_grid):
+
+        # Every cell of the pathfinding grid the barrier grid leaves free, as a mask over the playing field. A cell is
+        # the position cell * grid size, the same as for the flow field
+        self.grid_size = barrier_grid.grid_size
+        self.left = barrier_grid.left
+        self.right = barrier_grid.right
+        self.bottom = barrier_grid.bottom
+        self.top = barrier_grid.top
+        self.barrier_grid = barrier_grid
+        self.free = ~barrier_grid.blocked
+        barrier_grid.subscribe(self.on_barriers_changed)
+
+        # The free mask with the cells that have a blocked cell within so many cells of them taken out, by how many.
+        # Sprites bigger than the one the barriers were worked out for need that room around them
+        self.clear_masks = {0: self.free}
+
+        # Stats
+        self.queries = 0
+        self.misses = 0
+
+    def on_barriers_changed(self, region):
+
+        # Copy the changed cells over, the masks with room around the cells are made again when next asked for
+        left, right, bottom, top = (region[0] - self.left, region[1] - self.left + 1, region[2] - self.bottom,
+                                    region[3] - self.bottom + 1)
+        self.free[left:right, bottom:top] = ~self.barrier_grid.blocked[left:right, bottom:top]
+        self.clear_masks = {0: self.free}
+
+    def get_clear_mask(self, clearance):
+        mask = self.clear_masks.get(clearance)
+        if mask is None:
+            padded = np.pad(self.get_clear_mask(clearance - 1), 1, constant_values=False)
+            mask = padded[1:-1, 1:-1].copy()
+            for x in (-1, 0, 1):
+                for y in (-1, 0, 1):
+                    mask &= padded[1 + x:padded.shape[0] - 1 + x, 1 + y:padded.shape[1] - 1 + y]
+            self.clear_masks[clearance] = mask
+        return mask
+
+    def find_cells(self, center, min_distance, max_distance, margin=0, clearance=0):
+
+        # The positions of the free cells at min_distance to max_distance from the center, at least margin inside the
+        # edges of the field and with clearance free cells around them. Only the square of cells around the outer
+        # circle is looked at, so the time depends on the radius and not on the size of the map
+        left = max(self.left, math.ceil((center[0] - max_distance) / self.grid_size),
+                   math.ceil((self.left * self.grid_size + margin) / self.grid_size))
+        right = min(self.right, math.floor((center[0] + max_distance) / self.grid_size),
+                    math.floor((self.right * self.grid_size - margin) / self.grid_size))
+        bottom = max(self.bottom, math.ceil((center[1] - max_distance) / self.grid_size),
+                     math.ceil((self.bottom * self.grid_size + margin) / self.grid_size))
+        top = min(self.top, math.floor((center[1] + max_distance) / self.grid_size),
+                  math.floor((self.top * self.grid_size - margin) / self.grid_size))
+        if left > right or bottom > top:
+            return np.empty((0, 2))
+        mask = self.get_clear_mask(clearance)[left - self.left:right - self.left + 1,
+                                              bottom - self.bottom:top - self.bottom + 1]
+        cells_x, cells_y = np.nonzero(mask)
+        positions = np.column_stack(((cells_x + left) * self.grid_size, (cells_y + bottom) * self.grid_size))
+        distances = np.hypot(positions[:, 0] - center[0], positions[:, 1] - center[1])
+        return positions[(distances >= min_distance) & (distances <= max_distance)]
+
+    def sample(self, center, min_distance, max_distance, count=1, margin=0, clearance=0):
+
+        # Up to count different free positions in the ring around the center, picked with the game's random numbers.
+        # Fewer come back when the ring doesn't have enough free cells
+        self.queries += 1
+        positions = self.find_cells(center, min_distance, max_distance, margin, clearance)
+        if len(positions) < count:
+            self.misses += 1
+        picks = random.sample(range(len(positions)), min(count, len(positions)))
+        return [(float(positions[i, 0]), float(positions[i, 1])) for i in picks]
+
+    def sample_one(self, center, min_distance, max_distance, margin=0, clearance=0):
+        positions = self.sample(center, min_distance, max_distance, 1, margin, clearance)
+        return positions[0] if positions else None
@@ -0,0 +1,183 @@
+import operator
+
+import arcade
+import numpy as np
+import settings as s
+from ghost import GhostMonster
+
+# The ghost attributes the swarm reads from the sprites whenever ghosts are added or removed. The motion is only read
+# from new or reused ghosts, the swarm keeps it in its arrays from then on instead of writing it back to the sprites
+GHOST_STATE = ("center_x", "center_y", "movement_speed_modifier", "bob_frequency", "bob_amplitude",
+               "direction_lock_stop_time")
+GHOST_MOTION = ("change_x", "change_y", "time", "direction_lock_timer", "direction_lock", "is_hunting")
+get_ghost_state = operator.attrgetter(*GHOST_STATE)
+get_ghost_motion = operator.attrgetter(*GHOST_MOTION)
+get_ghost_flags = operator.attrgetter("health", "is_being_hurt")
+
+
+class GhostSwarm:
+    def __init__(self, seed=None):
+        self.sprites = []
+        self.rows = {}
+        self.generations = []
+        self.reset_count = -1
+        self.rng = np.random.default_rng(seed)
+
+        # Structure of arrays, one row per ghost in the same order as the ghost list
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.change_x = np.zeros(0)
+        self.change_y = np.zeros(0)
+        self.speed_modifier = np.zeros(0)
+        self.time = np.zeros(0)
+        self.bob_frequency = np.zeros(0)
+        self.bob_amplitude = np.zeros(0)
+        self.direction_lock_timer = np.zeros(0)
+        self.direction_lock_stop_time = np.zeros(0)
+        self.half_width = np.zeros(0)
+        self.half_height = np.zeros(0)
+        self.health = np.zeros(0)
+        self.is_being_hurt = np.zeros(0, dtype=bool)
+        self.is_hunting = np.zeros(0, dtype=bool)
+        self.is_facing_north = np.zeros(0, dtype=bool)
+        self.direction_lock = np.zeros(0, dtype=bool)
+
+        # Stats
+        self.resyncs = 0
+
+    def seed(self, seed):
+        self.rng = np.random.default_rng(seed)
+
+    def sync(self, ghost_list):
+
+        # Only rebuild the arrays when ghosts were added, removed or reused, comparing the lists is a fast
+        # identity check
+        if self.sprites == ghost_list.sprite_list and self.reset_count == GhostMonster.reset_count:
+            return
+        old_motion = np.column_stack((self.change_x, self.change_y, self.time, self.direction_lock_timer,
+                                      self.direction_lock, self.is_hunting))
+        old_rows, old_generations = self.rows, self.generations
+        self.sprites = list(ghost_list.sprite_list)
+        self.rows = {id(ghost): row for row, ghost in enumerate(self.sprites)}
+        self.generations = [ghost.generation for ghost in self.sprites]
+        self.reset_count = GhostMonster.reset_count
+        self.resyncs += 1
+
+        # Ghosts that were already in the swarm and haven't been reset since keep their motion from the arrays
+        state = np.array([get_ghost_state(ghost) for ghost in self.sprites], dtype=float).reshape(-1, len(GHOST_STATE))
+        (self.x, self.y, self.speed_modifier, self.bob_frequency, self.bob_amplitude,
+         self.direction_lock_stop_time) = state.T.copy()
+        motion = np.array([get_ghost_motion(ghost) for ghost in self.sprites], dtype=float)
+        motion = motion.reshape(-1, len(GHOST_MOTION))
+        kept_rows = [old_rows.get(id(ghost), -1) for ghost in self.sprites]
+        kept_rows = np.array([row if row >= 0 and old_generations[row] == ghost.generation else -1
+                              for ghost, row in zip(self.sprites, kept_rows)], dtype=int)
+        is_kept = kept_rows >= 0
+        motion[is_kept] = old_motion[kept_rows[is_kept]]
+        self.change_x, self.change_y, self.time, self.direction_lock_timer = motion[:, :4].T.copy()
+        self.direction_lock, self.is_hunting = motion[:, 4:].T.astype(bool)
+        self.half_width = np.array([ghost.width / 2 for ghost in self.sprites], dtype=float)
+        self.half_height = np.array([ghost.height / 2 for ghost in self.sprites], dtype=float)
+        self.is_facing_north = np.array([ghost.current_direction == ghost.directions[0] for ghost in self.sprites],
+                                        dtype=bool)
+
+    def gather(self, contacts=()):
+
+        # Health is changed by the projectiles and the hurt flag by the ghosts' animations, so read them every tick.
+        # Positions only change outside the swarm when the collision engine pushes ghosts, the ones in its contact
+        # pairs, so only those ghosts are read back
+        flags = np.array(list(map(get_ghost_flags, self.sprites)), dtype=float).reshape(-1, 2)
+        self.health = flags[:, 0].copy()
+        self.is_being_hurt = flags[:, 1].astype(bool)
+        for contact in contacts:
+            for sprite in contact:
+                row = self.rows.get(id(sprite))
+                if row is not None:
+                    self.x[row], self.y[row] = sprite.position
+
+    def integrate(self, delta_time):
+
+        # The vectorized version of GhostMonster.update
+        tick_scale = delta_time * s.TUNED_TICK_RATE
+        moving = ~self.is_being_hurt | (self.health > 0)
+        self.x[moving] += self.change_x[moving] * self.speed_modifier[moving] * tick_scale
+        self.y[moving] += self.change_y[moving] * self.speed_modifier[moving] * tick_scale
+
+        # Make the ghosts bob
+        self.time[moving] += delta_time
+        self.y[moving] += np.sin(self.time[moving] * self.bob_frequency[moving]) * self.bob_amplitude[moving] * \
+            tick_scale
+
+        # Update the ghosts' directions, then time the direction locks
+        unlocked = ~self.direction_lock
+        self.is_facing_north[unlocked] = self.change_y[unlocked] > 0
+        self.direction_lock[:] = True
+        self.direction_lock_timer += tick_scale
+        expired = self.direction_lock_timer > self.direction_lock_stop_time
+        self.direction_lock[expired] = False
+        self.direction_lock_timer[expired] = 0
+
+    def steer(self, flow_field, player_position, can_hunt, can_move):
+
+        # The vectorized version of MyGame.move_ghost
+        player_x, player_y = player_position
+        distances = np.hypot(self.x - player_x, self.y - player_y)
+        hunting = can_move & can_hunt & (distances < s.MONSTER_VISION_RANGE)
+        wandering = can_move & ~hunting
+
+        # Hunting ghosts head for the next cell of the flow field, or straight at the player in the last cell
+        next_x, next_y = flow_field.next_steps(self.x, self.y)
+        no_step = np.isnan(next_x)
+        next_x[no_step] = player_x
+        next_y[no_step] = player_y
+        angles = np.arctan2(next_y - self.y, next_x - self.x)
+        self.change_x[hunting] = np.cos(angles[hunting]) * s.MONSTER_MOVEMENT_SPEED
+        self.change_y[hunting] = np.sin(angles[hunting]) * s.MONSTER_MOVEMENT_SPEED
+
+        # Wandering ghosts pick a new random direction about once every hundred ticks
+        turning = wandering & (self.rng.integers(0, 101, len(self.x)) == 0)
+        count = int(turning.sum())
+        self.change_x[turning] = self.rng.uniform(-s.MONSTER_MOVEMENT_SPEED, s.MONSTER_MOVEMENT_SPEED, count)
+        self.change_y[turning] = self.rng.uniform(-s.MONSTER_MOVEMENT_SPEED, s.MONSTER_MOVEMENT_SPEED, count)
+        self.is_hunting[hunting] = True
+        self.is_hunting[wandering] = False
+
+    def update(self, ghost_list, flow_field, player, can_hunt, can_move, delta_time=1 / 60, contacts=()):
+        self.sync(ghost_list)
+        if not self.sprites:
+            return []
+        self.gather(contacts)
+        was_facing_north = self.is_facing_north.copy()
+        self.integrate(delta_time)
+        self.steer(flow_field, player.position, can_hunt, can_move & ~self.is_being_hurt)
+
+        # Ghosts that leave the playing field die
+        out_of_bounds = (self.x - self.half_width < 0) | (self.y + self.half_height > 2559) | \
+                        (self.x + self.half_width > 2559) | (self.y - self.half_height < 0)
+
+        # Only ghosts whose boxes are near the player need the exact hit box check against them
+        near_player = (np.abs(self.x - player.center_x) < self.half_width + player.width / 2) & \
+                      (np.abs(self.y - player.center_y) < self.half_height + player.height / 2)
+
+        # Every sprite only gets its new position, the rest goes to the few ghosts that turned, left the field or are
+        # near the player
+        sprites = self.sprites
+        for ghost, position in zip(sprites, zip(self.x.tolist(), self.y.tolist())):
+            ghost.position = position
+        for i in np.flatnonzero(self.is_facing_north != was_facing_north).tolist():
+            sprites[i].current_direction = sprites[i].directions[0 if self.is_facing_north[i] else 1]
+        for i in np.flatnonzero(out_of_bounds).tolist():
+            sprites[i].health = 0
+        return [sprites[i] for i in np.flatnonzero(near_player).tolist()
+                if arcade.check_for_collision(sprites[i], player)]
+
+    def get_hunting_count(self):
+        return int(self.is_hunting.sum())
+
+    def get_velocity(self, ghost):
+
+        # The ghost's velocity from the arrays, or from the sprite if it joined after the last update
+        row = self.rows.get(id(ghost))
+        if row is None or self.generations[row] != ghost.generation:
+            return ghost.change_x, ghost.change_y
+        return float(self.change_x[row]), float(self.change_y[row])
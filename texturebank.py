@@ -0,0 +1,182 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import arcade
+from arcade.texture import ImageData
+from PIL import Image
+import settings as s
+
+
+def load_animation_manifest(file_path=s.ANIMATION_MANIFEST):
+    with open(file_path) as manifest_file:
+        return json.load(manifest_file)
+
+
+def get_animation_name(entity, state, direction=None):
+    return f"{entity}_{state}" if direction is None else f"{entity}_{direction}_{state}"
+
+
+def frame_paths(pattern, frame_range, direction=None, ping_pong=False):
+
+    # The frame range is the start, stop and optional step of a range, ping pong animations play back to the start
+    file_paths = tuple(pattern.format(frame=i, direction=direction) for i in range(*frame_range))
+    return file_paths + file_paths[::-1] if ping_pong else file_paths
+
+
+def build_animations(manifest):
+
+    # Expand the frame ranges of the animation manifest into the frame files of every animation, by name. A state with
+    # frames per direction makes one animation per direction
+    animations = {}
+    for entity, entity_options in manifest.items():
+        for state, options in entity_options["states"].items():
+            pattern = options.get("path", entity_options.get("path"))
+            ping_pong = options.get("ping_pong", False)
+            if isinstance(options["frames"], dict):
+                for direction, frame_range in options["frames"].items():
+                    animations[get_animation_name(entity, state, direction)] = frame_paths(pattern, frame_range,
+                                                                                           direction, ping_pong)
+            else:
+                animations[get_animation_name(entity, state)] = frame_paths(pattern, options["frames"],
+                                                                            ping_pong=ping_pong)
+    return animations
+
+
+def load_atlas_manifest(file_path=s.ATLAS_MANIFEST):
+
+    # The manifest build_atlas.py writes next to the atlas pages, None when the atlas hasn't been built
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path) as manifest_file:
+        return json.load(manifest_file)
+
+
+def open_atlas_page(file_path):
+    page = Image.open(file_path)
+    page.load()
+    return page if page.mode == "RGBA" else page.convert("RGBA")
+
+
+class TextureBank:
+    def __init__(self, animation_manifest=None):
+        self.animation_manifest = animation_manifest if animation_manifest is not None else load_animation_manifest()
+        self.animations = build_animations(self.animation_manifest)
+        self.textures = {}
+        self.frames = {}
+
+        # The built atlas, the pages are only kept while the frames are being cut out of them
+        self.atlas_manifest = None
+        self.atlas_pages = None
+        self.hits = 0
+        self.misses = 0
+
+    def get_texture(self, file_path):
+        texture = self.textures.get(file_path)
+        if texture is not None:
+            self.hits += 1
+            return texture
+        self.misses += 1
+        return self.load_texture(file_path)
+
+    def get_frames(self, name):
+        frames = self.frames.get(name)
+        if frames is not None:
+            self.hits += 1
+            return frames
+        self.misses += 1
+
+        # Load each frame only once, even if it is shared between animations
+        try:
+            file_paths = self.animations[name]
+        except KeyError:
+            raise KeyError(f"No animation named '{name}' is registered in the texture bank") from None
+        frames = tuple(self.textures.get(file_path) or self.load_texture(file_path) for file_path in file_paths)
+        self.frames[name] = frames
+        return frames
+
+    def get_preload_paths(self, exclude=(), static_textures=s.STATIC_TEXTURES):
+
+        # The files preload loads by category, the start of the animation name, in order and without repeats. The
+        # textures the game loads by path make the static category, anything else is left to load on first use
+        categories = {}
+        seen = set()
+        for name in self.animations:
+            if name in exclude:
+                continue
+            file_paths = categories.setdefault(name.split("_")[0], {})
+            for file_path in self.animations[name]:
+                if file_path not in seen:
+                    seen.add(file_path)
+                    file_paths[file_path] = None
+        categories["static"] = {file_path: None for file_path in static_textures if file_path not in seen}
+        return categories
+
+    def preload(self, exclude=(), workers=s.TEXTURE_LOAD_WORKERS):
+
+        # Decode the frames of the animations a category at a time in a pool of threads, PIL lets go of the GIL while it
+        # decodes, then upload them to the atlas here on the main thread since GL can only be used from there. The
+        # excluded animations are left to load on first use. Returns the decode and upload times per category in
+        # milliseconds
+        categories = {category: [file_path for file_path in file_paths if file_path not in self.textures]
+                      for category, file_paths in self.get_preload_paths(exclude).items()}
+
+        atlas = arcade.get_window().ctx.default_atlas
+        timings = {}
+        with ThreadPoolExecutor(workers) as executor:
+
+            # With a built atlas the frames are cut out of a few big pages instead of opening every file, and the
+            # game's atlas is made big enough for all of them at once so it never has to grow and repack during play
+            manifest = load_atlas_manifest()
+            if manifest is not None:
+                start_time = time.perf_counter()
+                width, height = manifest["atlas_size"]
+                if width > atlas.width or height > atlas.height:
+                    atlas.resize((min(max(width, atlas.width), atlas.max_size[0]),
+                                  min(max(height, atlas.height), atlas.max_size[1])))
+                directory = os.path.dirname(s.ATLAS_MANIFEST)
+                self.atlas_manifest = manifest
+                self.atlas_pages = list(executor.map(open_atlas_page, [os.path.join(directory, page_name)
+                                                                       for page_name in manifest["pages"]]))
+                timings["decode atlas pages"] = (time.perf_counter() - start_time) * 1000
+
+            for category, file_paths in categories.items():
+                start_time = time.perf_counter()
+                textures = list(executor.map(self.decode_texture, file_paths))
+                decode_time = time.perf_counter()
+                for file_path, texture in zip(file_paths, textures):
+                    self.textures[file_path] = texture
+                    atlas.add(texture)
+                timings[f"decode {category}"] = (decode_time - start_time) * 1000
+                timings[f"upload {category}"] = (time.perf_counter() - decode_time) * 1000
+        self.atlas_pages = None
+        return timings
+
+    def decode_texture(self, file_path):
+        if self.atlas_pages is None or file_path not in self.atlas_manifest["textures"]:
+            return arcade.load_texture(file_path)
+
+        # Cut the frame out of its page, the hash and hit box were worked out when the atlas was built
+        entry = self.atlas_manifest["textures"][file_path]
+        x, y, width, height = entry["region"]
+        image = self.atlas_pages[entry["page"]].crop((x, y, x + width, y + height))
+        return arcade.Texture(ImageData(image, hash=entry["hash"]),
+                              hit_box_points=[tuple(point) for point in entry["hit_box"]])
+
+    def load_texture(self, file_path):
+        texture = self.decode_texture(file_path)
+        self.textures[file_path] = texture
+        return texture
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "textures": len(self.textures),
+            "animations": len(self.frames),
+        }
+
+
+# The process-wide bank shared by every sprite class
+texture_bank = TextureBank()
@@ -0,0 +1,76 @@
+import math
+
+import settings as s
+
+# A tick this close to due counts as due, so adding up frame times doesn't lose one
+TICK_EPSILON = 1e-6
+
+
+class FixedTimestep:
+    def __init__(self, rate=s.SIMULATION_RATE, max_ticks=s.MAX_TICKS_PER_FRAME):
+
+        # Collects the frame times and hands them out as whole ticks of the same length, the time left over waits for
+        # the next frame
+        self.tick_time = 1 / rate
+        self.max_ticks = max_ticks
+        self.accumulator = 0.0
+
+        # Stats
+        self.ticks = 0
+        self.dropped_ticks = 0
+
+    def advance(self, delta_time):
+
+        # Add a frame's time and return how many ticks to run for it. A frame that took too long only runs the max, the
+        # rest is dropped so the game slows down for a moment instead of falling further and further behind
+        self.accumulator += delta_time
+        ticks = int(self.accumulator / self.tick_time + TICK_EPSILON)
+        if ticks > self.max_ticks:
+            self.dropped_ticks += ticks - self.max_ticks
+            ticks = self.max_ticks
+            self.accumulator = 0.0
+        else:
+            self.accumulator = max(0.0, self.accumulator - ticks * self.tick_time)
+        self.ticks += ticks
+        return ticks
+
+    def get_alpha(self):
+
+        # How far the time is into the next tick, from 0 at the last tick to 1 at the next
+        return min(self.accumulator / self.tick_time, 1.0)
+
+
+class Interpolator:
+    def __init__(self, get_sprite_lists, max_distance=s.INTERPOLATE_MAX_DISTANCE):
+
+        # The sprite lists come from a function because the game swaps some of them for new ones
+        self.get_sprite_lists = get_sprite_lists
+        self.max_distance = max_distance
+
+        # Where every sprite was before the last tick, and where the ones moved for drawing really are
+        self.previous = {}
+        self.current = {}
+
+    def snapshot(self):
+        self.previous = {sprite: sprite.position for sprite_list in self.get_sprite_lists() for sprite in sprite_list}
+
+    def apply(self, alpha):
+
+        # Put the sprites part way between their last two ticks for drawing. New sprites, and ones that jumped further
+        # than a tick's movement like pooled sprites that were reused, are drawn where they are
+        for sprite_list in self.get_sprite_lists():
+            for sprite in sprite_list:
+                previous = self.previous.get(sprite)
+                if previous is None:
+                    continue
+                current = sprite.position
+                if math.dist(previous, current) > self.max_distance:
+                    continue
+                self.current[sprite] = current
+                sprite.position = (previous[0] + (current[0] - previous[0]) * alpha,
+                                   previous[1] + (current[1] - previous[1]) * alpha)
+
+    def restore(self):
+        for sprite, position in self.current.items():
+            sprite.position = position
+        self.current.clear()